@@ -0,0 +1,172 @@
+"""
+Compares the cost of handling incoming MIDI messages, by input method, under a clock-heavy
+stream (as sent by a DAW or drum machine with MIDI clock output enabled).
+
+    python benchmarks/midi_input.py [message count]
+
+No MIDI hardware is needed. Where python-rtmidi can open a virtual port (with ALSA, CoreMIDI
+or JACK), the stream is sent through one, and received both through an `RtMidiInput` and
+through a mido input port, set up as `MidiRunner` sets them up: so what's measured includes
+rtmidi's own filtering (`ignore_types`) and each port's callback. CPU time is then that of
+the thread the callbacks are run in.
+
+The simulated rows run anywhere: messages are fed straight to the code that each input
+method's callback hands them on to, with no port involved. The rtmidi one drops clock and
+active sensing beforehand, in place of `ignore_types`; the mido one parses each message
+into a `mido.Message`, as mido would.
+"""
+
+import random
+import sys
+from threading import Event
+from time import perf_counter, process_time, thread_time
+
+import mido
+try:
+    import rtmidi
+except ImportError:
+    rtmidi = None
+
+from playscript_autoscroller.control_slots import ControlSlots
+from playscript_autoscroller.midi_bindings import (
+    bound_statuses,
+    compile_bindings,
+    configured_bindings,
+    dispatch,
+)
+from playscript_autoscroller.rtmidi_input import RtMidiInput
+from playscript_autoscroller.ui.midi_config import MidiConfigDialog
+
+CLOCK = [0xF8]
+ACTIVE_SENSING = [0xFE]
+# Sent around the stream through a virtual port, to mark its start and end: a control on a
+# channel that the stream doesn't use.
+START = [0xBF, 119, 0]
+END = [0xBF, 119, 127]
+PORT_NAME = 'midi_input benchmark'
+TIMEOUT = 60 # s
+
+
+def make_stream(count, channel):
+    """80% clock, 5% active sensing, 10% other channels' CCs, 5% CCs of the scroll control."""
+    rng = random.Random(0)
+    stream = []
+    for _ in range(count):
+        pick = rng.random()
+        if pick < 0.8:
+            stream.append(CLOCK)
+        elif pick < 0.85:
+            stream.append(ACTIVE_SENSING)
+        elif pick < 0.95:
+            stream.append([0xB0 | (channel + 1) % 16, rng.randrange(120), rng.randrange(128)])
+        else:
+            stream.append([0xB0 | channel, 7, rng.randrange(128)])
+    return stream
+
+def report(label, sent, wall, cpu):
+    """Rates are per message sent, whether or not it reached the callback."""
+    print(f"{label:<48} {sent / wall:>12,.0f} msg/s {cpu / sent * 1e6:>8.2f} µs CPU/msg")
+
+def run(label, callback, stream, sent=None):
+    wall = perf_counter()
+    cpu = process_time()
+    for data in stream:
+        callback(data)
+    report(label, sent or len(stream), perf_counter() - wall, process_time() - cpu)
+
+def run_port(label, midi_out, open_port, handle, stream):
+    """
+    Sends the stream out of a virtual port, to be received by the port that `open_port`
+    opens, given the virtual port's name and a callback to pass each message's bytes to.
+    """
+    marks = []
+    done = Event()
+    def on_data(data):
+        if data in (START, END):
+            marks.append((perf_counter(), thread_time()))
+            if data == END:
+                done.set()
+        else:
+            handle(data)
+
+    name = next(name for name in mido.get_input_names() if PORT_NAME in name)
+    port = open_port(name, on_data)
+    try:
+        midi_out.send_message(START)
+        for data in stream:
+            midi_out.send_message(data)
+        midi_out.send_message(END)
+        if not done.wait(TIMEOUT):
+            print(f"{label:<48} timed out, with messages lost")
+            return
+    finally:
+        port.close()
+
+    (start_wall, start_cpu), (end_wall, end_cpu) = marks
+    report(label, len(stream), end_wall - start_wall, end_cpu - start_cpu)
+
+def open_mido(name, on_data):
+    return mido.open_input(name, callback=lambda message: on_data(message.bytes()))
+
+def open_rtmidi(name, on_data):
+    port = RtMidiInput(name)
+    port.callback = on_data
+    return port
+
+def open_virtual_port():
+    """An rtmidi output port for the benchmark to send through; or None if unsupported."""
+    if not rtmidi:
+        print("(python-rtmidi is not available: simulated input only)")
+        return None
+    midi_out = rtmidi.MidiOut()
+    try:
+        midi_out.open_virtual_port(PORT_NAME)
+    except (NotImplementedError, rtmidi.RtMidiError) as error:
+        midi_out.delete()
+        print(f"(Virtual MIDI ports are not supported here: simulated input only. {error})")
+        return None
+    return midi_out
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    config = {**MidiConfigDialog.Defaults, 'channel': 0}
+    slots = ControlSlots(2)
+    table = compile_bindings(
+        configured_bindings(config), slots.store, {action: lambda: None for action in (
+            'pause', 'ignore', 'next_heading', 'previous_heading', 'zoom_in', 'zoom_out')})
+    statuses = bound_statuses(table)
+    stream = make_stream(count, config['channel'])
+
+    def mido_path(data):
+        # As when opened through mido: parsed into a `Message`, then turned back into bytes.
+        message = mido.Message.from_bytes(data)
+        data = message.bytes()
+        if data[0] in statuses:
+            dispatch(table, statuses, data)
+
+    def raw_path(data):
+        if data[0] in statuses:
+            dispatch(table, statuses, data)
+
+    ignorable = sum(data in (CLOCK, ACTIVE_SENSING) for data in stream)
+    print(f"{count:,} messages, of which {ignorable:,} clock/active sensing")
+
+    midi_out = open_virtual_port()
+    if midi_out:
+        try:
+            run_port("mido input (virtual port)", midi_out, open_mido, raw_path, stream)
+            run_port(
+                "python-rtmidi input (virtual port)", midi_out, open_rtmidi, raw_path, stream)
+        finally:
+            midi_out.close_port()
+            midi_out.delete()
+
+    run("mido input (simulated)", mido_path, stream)
+    run("python-rtmidi input (simulated, no ignore_types)", raw_path, stream)
+    # python-rtmidi's `ignore_types` drops clock and active sensing before reaching Python.
+    reaching_python = [data for data in stream if data not in (CLOCK, ACTIVE_SENSING)]
+    run("python-rtmidi input (simulated)", raw_path, reaching_python, count)
+
+
+if __name__ == '__main__':
+    main()
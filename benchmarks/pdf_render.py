@@ -0,0 +1,109 @@
+"""
+Compares rendering the pages of a PDF in-process (in worker threads) with rendering them in
+separate worker processes (see `RenderServer`).
+
+    python benchmarks/pdf_render.py <file.pdf> [dpi] [page count]
+
+As well as how long each method takes to render the pages, reports how responsive the GUI
+thread stays meanwhile: a timer is set to fire every few milliseconds, and the gaps between
+its firings are measured. (Long gaps are what would show as stutter when scrolling.)
+"""
+
+import statistics
+import sys
+from time import perf_counter
+
+from qtpy.QtCore import QTimer
+from qtpy.QtWidgets import QApplication
+
+from popplerqt5 import Poppler
+
+from playscript_autoscroller.ui.pdf.page_renderer import PageRenderer
+from playscript_autoscroller.ui.pdf.render_server import RenderServer
+
+THREADS = 2
+TICK = 4 # ms
+
+
+def run(app, renderer, pages, dpi):
+    remaining = set(range(len(pages)))
+    def on_rendered(page_num, _, __):
+        remaining.discard(page_num)
+    renderer.pageRendered.connect(on_rendered)
+
+    gaps = []
+    last_tick = [perf_counter()]
+    def on_tick():
+        now = perf_counter()
+        gaps.append(now - last_tick[0])
+        last_tick[0] = now
+    timer = QTimer()
+    timer.setInterval(TICK)
+    timer.timeout.connect(on_tick)
+
+    start = perf_counter()
+    timer.start()
+    for page_num, page in enumerate(pages):
+        renderer.request(page_num, page, dpi)
+    while remaining:
+        app.processEvents()
+    elapsed = perf_counter() - start
+    timer.stop()
+    renderer.pageRendered.disconnect(on_rendered)
+
+    gaps.sort()
+    return {
+        'elapsed': elapsed,
+        'per_page': elapsed / len(pages),
+        'gap_p95': gaps[int(len(gaps) * 0.95)] if gaps else 0,
+        'gap_max': gaps[-1] if gaps else 0,
+        'gap_mean': statistics.mean(gaps) if gaps else 0,
+    }
+
+
+def main():
+    filename = sys.argv[1]
+    dpi = float(sys.argv[2]) if len(sys.argv) > 2 else 150
+    app = QApplication([])
+
+    document = Poppler.Document.load(filename)
+    # pylint: disable=no-member
+    document.setRenderHint(Poppler.Document.RenderHint.Antialiasing, True)
+    document.setRenderHint(Poppler.Document.RenderHint.TextAntialiasing, True)
+    page_count = document.numPages()
+    if len(sys.argv) > 3:
+        page_count = min(page_count, int(sys.argv[3]))
+    hints = int(document.renderHints())
+
+    server = RenderServer(THREADS)
+    server.set_document(filename)
+    # Start the worker processes before timing anything.
+    warm_up = server.page(0, hints).render(dpi, None)
+    if warm_up is None:
+        server.shutdown()
+        sys.exit(f"The render server couldn't render page 1 of {filename}")
+    warm_up.release()
+    warm_up.release()
+
+    renderer = PageRenderer(max_threads=THREADS)
+    results = {
+        'in-process': run(
+            app, renderer, [document.page(idx) for idx in range(page_count)], dpi),
+        'render server': run(
+            app, renderer, [server.page(idx, hints) for idx in range(page_count)], dpi),
+    }
+    renderer.shutdown()
+    server.shutdown()
+
+    print(f"{page_count} pages at {dpi:g} dpi, {THREADS} threads/processes, "
+          f"GUI timer every {TICK} ms\n")
+    print(f"{'':<15}{'total (s)':>12}{'per page (ms)':>15}"
+          f"{'gap mean (ms)':>15}{'gap p95 (ms)':>14}{'gap max (ms)':>14}")
+    for name, result in results.items():
+        print(f"{name:<15}{result['elapsed']:>12.2f}{result['per_page'] * 1000:>15.1f}"
+              f"{result['gap_mean'] * 1000:>15.1f}{result['gap_p95'] * 1000:>14.1f}"
+              f"{result['gap_max'] * 1000:>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
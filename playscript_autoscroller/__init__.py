@@ -49,6 +49,7 @@ __app_name__ = "Playscript Autoscroller"
 __app_icon__ = f"{path.dirname(__file__)}/ui/icons/playscript-autoscroller.svg"
 __author__ = "s0600204"
 __doc__ = "MIDI-controllable autoscroller for theatre playscripts"
+__cache_dir__ = _app_dirs.user_cache_dir
 __config_file__ = path.join(_app_dirs.user_config_dir, "config.yaml")
 __version__ = version(path.split(path.dirname(__file__))[-1])
 __version_info__ = _split_vers(__version__)
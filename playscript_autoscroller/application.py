@@ -21,6 +21,7 @@ class Application(QObject):
     def __init__(self):
         super().__init__()
         self._config = None
+        self._config_defaults = {}
         self._document_dirty = False
         self._document_filename = None
 
@@ -72,7 +73,7 @@ class Application(QObject):
             if not filecontent:
                 print("PDF Module not installed!")
                 return
-            self._mainwindow.show_pdf(filecontent)
+            self._mainwindow.show_pdf(filecontent, filename)
         else:
             filecontent = read_document_file(filename)
             self._mainwindow.restore_content(filetype, filecontent)
@@ -105,6 +106,10 @@ class Application(QObject):
                 "No valid configuration found")
             return
 
+        # Sections added in later versions of the program may be missing from older files.
+        for section, default_values in self._config_defaults.items():
+            config.setdefault(section, default_values)
+
         self._config = config
         self._mainwindow.show_status_message(
             "Configuration restored")
@@ -115,6 +120,8 @@ class Application(QObject):
         if not self._config:
             self._config = {}
 
+        self._config_defaults[section] = default_values
+
         if section not in self._config:
             self._config[section] = default_values
 
@@ -139,3 +146,5 @@ class Application(QObject):
     def start(self):
         self._mainwindow.retranslate_ui()
         self._mainwindow.show()
+        self._mainwindow.sync_frame_rate()
+        self._mainwindow.windowHandle().screenChanged.connect(self._mainwindow.sync_frame_rate)
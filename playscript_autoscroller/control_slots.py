@@ -0,0 +1,27 @@
+class ControlSlots:
+    """
+    Holds the most recent value received for each of a fixed number of controls.
+
+    Values are stored by the MIDI callback thread and collected by the GUI thread (once per
+    frame), so however many messages arrive between frames, only the newest is acted upon.
+
+    No lock is needed: each write or read is a single list-item assignment, which is atomic
+    under the GIL. The writer stores the value *before* raising the dirty flag, and the
+    reader lowers the flag *before* reading the value; thus a value written mid-read is, at
+    worst, collected again on the next frame, but never lost.
+    """
+
+    def __init__(self, count):
+        self._values = [0] * count
+        self._dirty = [False] * count
+
+    def store(self, slot, value):
+        self._values[slot] = value
+        self._dirty[slot] = True
+
+    def take(self, slot):
+        """Returns the latest value if it has not yet been collected, else `None`."""
+        if not self._dirty[slot]:
+            return None
+        self._dirty[slot] = False
+        return self._values[slot]
@@ -0,0 +1,76 @@
+"""
+Decoding of high (14-bit) resolution MIDI controls.
+
+Scroll values are passed around the program at 14-bit resolution (0 - 16383), whatever the
+resolution of their source; values from 7-bit sources are shifted up to match.
+
+The decoders below are run from the MIDI callback thread: their state is held in a fixed
+set of integer slots, so that nothing needs to be allocated per message.
+"""
+
+SHIFT = 7
+STEP = 1 << SHIFT # A 7-bit step, in 14-bit units
+MAXIMUM = (1 << 14) - 1
+
+# Control Change numbers with fixed meanings
+DATA_ENTRY_MSB = 6
+DATA_ENTRY_LSB = 38
+NRPN_LSB = 98
+NRPN_MSB = 99
+RPN_LSB = 100
+RPN_MSB = 101
+
+def from_7bit(value):
+    return value << SHIFT
+
+
+class Cc14Decoder:
+    """
+    Pairs a Control Change (0 - 31) carrying the most significant 7 bits of a value with the
+    Control Change 32 higher carrying the least significant 7 bits.
+
+    Per the MIDI specification, receipt of the MSB resets the LSB to zero.
+    """
+    __slots__ = ('_msb',)
+
+    def __init__(self):
+        self._msb = 0
+
+    def lsb(self, value):
+        return self._msb << SHIFT | value
+
+    def msb(self, value):
+        self._msb = value
+        return value << SHIFT
+
+
+class NrpnDecoder:
+    """
+    Follows the Non-Registered Parameter Number selected on a channel, decoding Data Entry
+    messages addressed to `parameter`.
+    """
+    __slots__ = ('_parameter', '_selected_msb', '_selected_lsb', '_data_msb')
+
+    def __init__(self, parameter):
+        self._parameter = parameter
+        self._selected_msb = -1
+        self._selected_lsb = -1
+        self._data_msb = 0
+
+    def control_change(self, control, value):
+        """Returns the decoded value, or `None` if the message didn't give a new one."""
+        if control == NRPN_MSB:
+            self._selected_msb = value
+        elif control == NRPN_LSB:
+            self._selected_lsb = value
+        elif control in (RPN_MSB, RPN_LSB):
+            # Data Entry now refers to a Registered Parameter.
+            self._selected_msb = -1
+            self._selected_lsb = -1
+        elif self._selected_msb << SHIFT | self._selected_lsb == self._parameter:
+            if control == DATA_ENTRY_MSB:
+                self._data_msb = value
+                return value << SHIFT
+            if control == DATA_ENTRY_LSB:
+                return self._data_msb << SHIFT | value
+        return None
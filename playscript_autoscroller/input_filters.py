@@ -0,0 +1,115 @@
+"""
+Filters to smooth out the jitter of cheap (or worn) expression pedals.
+
+Each is fed the latest raw value of its control (in 7-bit steps, though not necessarily a
+whole number of them) once per frame, along with the (monotonic) time of that frame, and
+returns the filtered value. The strength of each filter is set with
+an "amount" between 1 (lightest) and 10 (heaviest).
+"""
+
+from math import exp, pi
+
+
+class NullFilter:
+    __slots__ = ()
+
+    def __init__(self, _=None):
+        pass
+
+    def reset(self, value):
+        pass
+
+    def update(self, raw, _):
+        return raw
+
+
+class EmaFilter:
+    """Exponential moving average, with a time constant of 15ms per unit of amount."""
+    __slots__ = ('_time_constant', '_value', '_last')
+
+    def __init__(self, amount):
+        self._time_constant = 0.015 * amount
+        self._value = 0.0
+        self._last = None
+
+    def reset(self, value):
+        self._value = float(value)
+        self._last = None
+
+    def update(self, raw, now):
+        if self._last is not None:
+            self._value += (raw - self._value) * (1 - exp((self._last - now) / self._time_constant))
+        self._last = now
+        return self._value
+
+
+class OneEuroFilter:
+    """
+    Casiez, Roussel & Vogel's "1€ filter": heavy smoothing whilst the control is held still,
+    light smoothing (and so little lag) whilst it is being moved.
+    """
+    __slots__ = ('_min_cutoff', '_beta', '_value', '_derivative', '_last')
+
+    DerivativeCutoff = 1.0 # Hz
+
+    def __init__(self, amount):
+        self._min_cutoff = 3.0 / amount
+        self._beta = 0.05
+        self._value = 0.0
+        self._derivative = 0.0
+        self._last = None
+
+    @staticmethod
+    def _smoothing_factor(elapsed, cutoff):
+        return 1 / (1 + 1 / (2 * pi * cutoff * elapsed))
+
+    def reset(self, value):
+        self._value = float(value)
+        self._derivative = 0.0
+        self._last = None
+
+    def update(self, raw, now):
+        if self._last is None:
+            self._last = now
+            return self._value
+
+        elapsed = now - self._last
+        if elapsed <= 0:
+            return self._value
+        self._last = now
+
+        derivative = (raw - self._value) / elapsed
+        self._derivative += (derivative - self._derivative) \
+            * self._smoothing_factor(elapsed, self.DerivativeCutoff)
+
+        cutoff = self._min_cutoff + self._beta * abs(self._derivative)
+        self._value += (raw - self._value) * self._smoothing_factor(elapsed, cutoff)
+        return self._value
+
+
+class HysteresisFilter:
+    """Ignores changes of `amount` steps or fewer, except at either end of the range."""
+    __slots__ = ('_width', '_value')
+
+    def __init__(self, amount):
+        self._width = amount
+        self._value = 0
+
+    def reset(self, value):
+        self._value = value
+
+    def update(self, raw, _):
+        if abs(raw - self._value) > self._width or raw <= 0 or raw >= 127:
+            self._value = raw
+        return self._value
+
+
+FILTERS = {
+    'none': NullFilter,
+    'ema': EmaFilter,
+    'one_euro': OneEuroFilter,
+    'hysteresis': HysteresisFilter,
+}
+
+def create_filter(name, amount):
+    return FILTERS.get(name, NullFilter)(amount)
@@ -0,0 +1,121 @@
+"""
+Measurement of the time taken for a MIDI message to take effect.
+
+Each message is timed from its arrival (as stamped by `MidiEventQueue`) until it reaches
+each of a series of stages:
+* dispatch: its handlers have been run (in the MIDI dispatch thread),
+* frame: its value has been picked up, at the start of a display frame,
+* scroll: the content has been scrolled in response,
+* paint: the scrolled content has started to be repainted.
+
+Latencies are gathered into histograms of fixed size, so the cost of recording one doesn't
+grow the longer the program runs.
+"""
+
+from bisect import bisect_left
+from threading import Lock
+from time import perf_counter
+
+
+STAGES = ('dispatch', 'frame', 'scroll', 'paint')
+
+
+class LatencyHistogram:
+    """Counts of latencies in logarithmically sized buckets, from 1 µs to 10 s."""
+    __slots__ = ('_counts', 'count', 'total', 'maximum')
+
+    # Each bucket's upper bound is ~12% above its lower.
+    Bounds = tuple(1e-6 * 10 ** (step / 20) for step in range(141))
+
+    def __init__(self):
+        self._counts = [0] * (len(self.Bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def add(self, latency):
+        self._counts[bisect_left(self.Bounds, latency)] += 1
+        self.count += 1
+        self.total += latency
+        self.maximum = max(self.maximum, latency)
+
+    def percentile(self, percent):
+        """The upper bound of the bucket the given percentile falls in."""
+        if not self.count:
+            return 0.0
+        wanted = self.count * percent / 100
+        seen = 0
+        for idx, count in enumerate(self._counts):
+            seen += count
+            if seen >= wanted:
+                return min(self.Bounds[idx], self.maximum) if idx < len(self.Bounds) \
+                    else self.maximum
+        return self.maximum
+
+    def summary(self):
+        """In seconds."""
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'max': self.maximum,
+        }
+
+
+class LatencyMonitor:
+    """
+    Per-stage latency histograms.
+
+    Stages after `frame` are reached some frames after the message arrived (if at all: the
+    scroller may be paused). So the arrival time of the oldest message not yet through a
+    stage is held until the stage is reached, or until it has been waiting for longer than
+    `Timeout`, in which case it's assumed to have had no visible effect (and gives way to the
+    next message expected at that stage).
+
+    Used from both the MIDI dispatch thread and the GUI thread.
+    """
+
+    Timeout = 1.0 # s
+
+    def __init__(self):
+        self._histograms = {stage: LatencyHistogram() for stage in STAGES}
+        self._pending = {}
+        self._lock = Lock()
+
+    def _expect(self, stage, arrival):
+        pending = self._pending.get(stage)
+        if pending is None or arrival - pending > self.Timeout:
+            self._pending[stage] = arrival
+
+    def expect(self, stage, arrival):
+        with self._lock:
+            self._expect(stage, arrival)
+
+    def reach(self, stage, next_stage=None):
+        now = perf_counter()
+        with self._lock:
+            arrival = self._pending.pop(stage, None)
+            if arrival is None:
+                return
+            latency = now - arrival
+            if latency > self.Timeout:
+                return
+            self._histograms[stage].add(latency)
+            if next_stage:
+                self._expect(next_stage, arrival)
+
+    def record(self, stage, arrival):
+        latency = perf_counter() - arrival
+        with self._lock:
+            self._histograms[stage].add(latency)
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {stage: LatencyHistogram() for stage in STAGES}
+            self._pending = {}
+
+    def summary(self):
+        with self._lock:
+            return {stage: histogram.summary() for stage, histogram in self._histograms.items()}
@@ -0,0 +1,199 @@
+"""
+Bindings between MIDI controls and the actions they perform.
+
+A binding is a dict of:
+* action: one of `ACTIONS`,
+* type: one of `BINDING_TYPES`,
+* channel: the MIDI channel (0 - 15),
+* number: the control, note or NRPN number (ignored for pitch bend).
+
+Any number of bindings may share an action, or a control. Scrolling and the midpoint follow
+the value of a control, so may be bound to any type but notes; the other actions are
+triggered by a note, or by a Control Change switch (see `binding_types`).
+
+So that each incoming message only costs one lookup, bindings are compiled into a dispatch
+table, keyed by `(message type, channel, control/note number)` and giving the handlers to
+call with `(control/note number, value)`.
+
+Messages are dispatched from their raw bytes: nothing is decoded unless the status byte
+shows it to be of a type and channel that something is bound to.
+"""
+
+from .high_resolution import (
+    DATA_ENTRY_LSB,
+    DATA_ENTRY_MSB,
+    NRPN_LSB,
+    NRPN_MSB,
+    RPN_LSB,
+    RPN_MSB,
+    SHIFT,
+    STEP,
+    Cc14Decoder,
+    NrpnDecoder,
+    from_7bit,
+)
+
+ACTIONS = (
+    'scroll',
+    'midpoint',
+    'pause',
+    'ignore',
+    'next_heading',
+    'previous_heading',
+    'zoom_in',
+    'zoom_out',
+)
+CONTINUOUS_ACTIONS = ('scroll', 'midpoint')
+BINDING_TYPES = ('cc', 'cc14', 'nrpn', 'pitchwheel', 'note')
+HIGH_RESOLUTION_TYPES = ('cc14', 'nrpn', 'pitchwheel')
+CONTINUOUS_TYPES = ('cc', 'cc14', 'nrpn', 'pitchwheel')
+TRIGGER_TYPES = ('cc', 'note')
+
+SCROLL_SLOT = 0
+MIDPOINT_SLOT = 1
+
+# Status bytes (less channel) of the message types that may be bound
+MESSAGE_STATUSES = {
+    'note_on': 0x90,
+    'control_change': 0xB0,
+    'pitchwheel': 0xE0,
+}
+
+
+def _continuous_handlers(binding_type, number, deliver):
+    # `deliver` is passed a 14-bit value.
+    if binding_type == 'cc':
+        def cc_handler(_, value):
+            deliver(from_7bit(value))
+        yield 'control_change', number, cc_handler
+
+    elif binding_type == 'cc14':
+        decoder = Cc14Decoder()
+        def msb_handler(_, value):
+            deliver(decoder.msb(value))
+        def lsb_handler(_, value):
+            deliver(decoder.lsb(value))
+        yield 'control_change', number, msb_handler
+        yield 'control_change', number + 32, lsb_handler
+
+    elif binding_type == 'nrpn':
+        decoder = NrpnDecoder(number)
+        def nrpn_handler(control, value):
+            value = decoder.control_change(control, value)
+            if value is not None:
+                deliver(value)
+        for control in (NRPN_MSB, NRPN_LSB, RPN_MSB, RPN_LSB, DATA_ENTRY_MSB, DATA_ENTRY_LSB):
+            yield 'control_change', control, nrpn_handler
+
+    elif binding_type == 'pitchwheel':
+        def pitchwheel_handler(_, value):
+            deliver(value)
+        yield 'pitchwheel', 0, pitchwheel_handler
+
+def _trigger_handlers(binding_type, number, trigger):
+    if binding_type == 'note':
+        def note_handler(_, velocity):
+            # A Note On of zero velocity is a Note Off
+            if velocity:
+                trigger()
+        yield 'note_on', number, note_handler
+
+    elif binding_type == 'cc':
+        def cc_handler(_, value):
+            # Switches send 127 (or thereabouts) when pressed, 0 when released
+            if value >= 64:
+                trigger()
+        yield 'control_change', number, cc_handler
+
+def binding_types(action):
+    """The types of message that an action may be bound to."""
+    return CONTINUOUS_TYPES if action in CONTINUOUS_ACTIONS else TRIGGER_TYPES
+
+def unusable_bindings(bindings):
+    """Those bindings (of a hand-edited config, say) of an action to a type it can't use."""
+    return [
+        binding for binding in bindings
+        if binding['type'] not in binding_types(binding['action'])
+    ]
+
+def compile_bindings(bindings, store, triggers):
+    """
+    :param store: called with `(slot, value)` for continuous actions
+    :param triggers: dict of callables, one per non-continuous action
+    """
+    table = {}
+    for binding in bindings:
+        action = binding['action']
+        if action in CONTINUOUS_ACTIONS:
+            slot = SCROLL_SLOT if action == 'scroll' else MIDPOINT_SLOT
+            shift = 0 if action == 'scroll' else SHIFT
+            def deliver(value, slot=slot, shift=shift):
+                store(slot, value >> shift)
+            handlers = _continuous_handlers(binding['type'], binding['number'], deliver)
+        else:
+            handlers = _trigger_handlers(binding['type'], binding['number'], triggers[action])
+
+        for message_type, number, handler in handlers:
+            key = (message_type, binding['channel'], number)
+            table[key] = table.get(key, ()) + (handler,)
+    return table
+
+def bound_statuses(table):
+    """The status bytes of all messages that a dispatch table has handlers for."""
+    return frozenset(MESSAGE_STATUSES[message_type] | channel for message_type, channel, _ in table)
+
+def dispatch(table, statuses, data):
+    """Passes a message, given as bytes, to its handlers in a dispatch table (if any)."""
+    status = data[0]
+    if status not in statuses:
+        return
+
+    kind = status & 0xF0
+    if kind == 0xB0:
+        key, value = ('control_change', status & 0x0F, data[1]), data[2]
+    elif kind == 0x90:
+        key, value = ('note_on', status & 0x0F, data[1]), data[2]
+    else:
+        # Pitch bend: 14-bit, least significant 7 bits first
+        key, value = ('pitchwheel', status & 0x0F, 0), data[1] | data[2] << SHIFT
+
+    for handler in table.get(key, ()):
+        handler(key[2], value)
+
+def configured_bindings(config):
+    """The bindings of the fixed controls in the MIDI config, followed by any additional."""
+    channel = config['channel']
+    scroll_type = config['scroll_source']
+    bindings = [
+        {
+            'action': 'scroll',
+            'type': scroll_type,
+            'channel': channel,
+            'number': config['scroll_nrpn' if scroll_type == 'nrpn' else 'scroll_control'],
+        }, {
+            'action': 'midpoint',
+            'type': 'cc',
+            'channel': channel,
+            'number': config['midpoint_control'],
+        }, {
+            'action': 'ignore',
+            'type': 'note',
+            'channel': channel,
+            'number': config['ignore_note'],
+        }, {
+            'action': 'pause',
+            'type': 'note',
+            'channel': channel,
+            'number': config['pause_note'],
+        },
+    ]
+    for binding in config.get('bindings', []):
+        bindings.append({'channel': channel, **binding})
+    return bindings
+
+def scroll_resolution(bindings):
+    """The step (at 14-bit resolution) that the controls bound to scrolling move in."""
+    for binding in bindings:
+        if binding['action'] == 'scroll' and binding['type'] in HIGH_RESOLUTION_TYPES:
+            return 1
+    return STEP
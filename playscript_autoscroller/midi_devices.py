@@ -1,8 +1,11 @@
 
 import os
+from threading import Thread
 
 import mido
 
+from qtpy.QtCore import QObject, Signal as QSignal
+
 
 class MidiDevice:
     def __init__(self, name):
@@ -32,6 +35,9 @@ class MidiDevice:
     def register_in_port(self, port):
         self._in_ports.append(port)
 
+    def unregister_in_port(self, port):
+        self._in_ports.remove(port)
+
 
 class InPort:
     def __init__(self, mido_name):
@@ -88,23 +94,73 @@ class InPort:
 
 
 class MidiDevices:
+    """
+    Cache of the MIDI input ports (grouped by device) that are present on the system.
+
+    Updating the cache only parses the names of ports not seen before, and reports which
+    ports have been added and removed, so that views may be updated incrementally.
+    """
 
     def __init__(self):
         self._devices = {}
         self._ports = {}
 
+    def device(self, device_num):
+        return self._devices.get(device_num)
+
     def devices(self):
         return self._devices.values()
 
     def refresh(self):
-        processed = []
-        for full_name in mido.get_input_names():
-            port = InPort(full_name)
-            if port.port_id in processed:
+        """Note: this calls into the MIDI backend, so is best not run from the GUI thread."""
+        return self.update(mido.get_input_names())
+
+    def update(self, mido_names):
+        current = {}
+        port_ids = set()
+        for mido_name in mido_names:
+            port = self._ports.get(mido_name) or InPort(mido_name)
+            if port.port_id in port_ids:
                 continue
-            processed.append(port.port_id)
+            port_ids.add(port.port_id)
+            current[mido_name] = port
 
+        removed = [port for name, port in self._ports.items() if name not in current]
+        added = [port for name, port in current.items() if name not in self._ports]
+
+        for port in removed:
+            device = self._devices[port.device_num]
+            device.unregister_in_port(port)
+            if not device.in_ports:
+                del self._devices[port.device_num]
+
+        for port in added:
             if port.device_num not in self._devices:
                 self._devices[port.device_num] = MidiDevice(port.device_name)
             self._devices[port.device_num].register_in_port(port)
-            self._ports[port.port_id] = port
+
+        self._ports = current
+        return added, removed
+
+
+class MidiDeviceScanner(QObject):
+    """Fetches the names of the MIDI input ports present, from a background thread."""
+
+    Scanned = QSignal(list, name='scanned')
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._thread = None
+
+    def _run(self):
+        try:
+            mido_names = mido.get_input_names()
+        except (IOError, RuntimeError):
+            mido_names = []
+        self.Scanned.emit(mido_names)
+
+    def scan(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
@@ -0,0 +1,97 @@
+from collections import deque
+from threading import Condition, Thread
+from time import perf_counter
+
+
+class SourceCounters:
+    """Throughput and latency of the messages from one source."""
+    __slots__ = ('messages', 'first_arrival', 'last_arrival', 'total_latency', 'max_latency')
+
+    def __init__(self, arrival):
+        self.messages = 0
+        self.first_arrival = arrival
+        self.last_arrival = arrival
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def as_dict(self):
+        duration = self.last_arrival - self.first_arrival
+        return {
+            'messages': self.messages,
+            'rate': self.messages / duration if duration else 0.0,
+            'mean_latency': self.total_latency / self.messages if self.messages else 0.0,
+            'max_latency': self.max_latency,
+        }
+
+
+class MidiEventQueue:
+    """
+    Merges the messages of any number of MIDI inputs into one stream.
+
+    Each input's backend calls `put` from its own thread; messages are stamped with their
+    source and time of arrival, and passed on to `handler(source, arrival, message)` in the
+    order they arrived, from a single dispatch thread. This way the handler never has to
+    cope with being run concurrently.
+
+    Latency is counted from arrival until the handler returns.
+    """
+
+    def __init__(self, handler):
+        self._handler = handler
+        self._events = deque()
+        self._ready = Condition()
+        self._running = False
+        self._thread = None
+        self._counters = {}
+
+    def __len__(self):
+        return len(self._events)
+
+    @property
+    def stats(self):
+        """Counters for each source, in seconds and messages per second."""
+        return {source: counters.as_dict() for source, counters in list(self._counters.items())}
+
+    def _dispatch(self, arrival, source, message):
+        self._handler(source, arrival, message)
+
+        latency = perf_counter() - arrival
+        counters = self._counters.get(source)
+        if not counters:
+            counters = self._counters[source] = SourceCounters(arrival)
+        counters.messages += 1
+        counters.last_arrival = arrival
+        counters.total_latency += latency
+        counters.max_latency = max(counters.max_latency, latency)
+
+    def _run(self):
+        while True:
+            with self._ready:
+                while self._running and not self._events:
+                    self._ready.wait()
+                if not self._running:
+                    return
+                event = self._events.popleft()
+            self._dispatch(*event)
+
+    def put(self, source, message):
+        # Stamped whilst holding the lock, so the queue is always in order of arrival.
+        with self._ready:
+            self._events.append((perf_counter(), source, message))
+            self._ready.notify()
+
+    def reset_stats(self):
+        self._counters = {}
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._ready:
+            self._running = False
+            self._events.clear()
+            self._ready.notify()
@@ -0,0 +1,137 @@
+from threading import Event, Lock, Thread
+from time import perf_counter
+
+import mido
+
+from qtpy.QtCore import QObject, Signal as QSignal
+
+
+class HotplugMonitor(QObject):
+    """
+    Watches, from a background thread, for MIDI input devices being (dis)connected.
+
+    When a watched device that isn't open appears, it is opened (in the background thread,
+    so the GUI thread is never kept waiting) and handed over through `portOpened`. When an
+    open device disappears, `deviceLost` is emitted. A watched device that isn't present is
+    reported (once) through `deviceMissing`.
+
+    Whilst a device is missing, the time between checks doubles (up to `max_interval`).
+
+    Devices are opened with `opener` (by default `mido.open_input`).
+    """
+
+    PortOpened = QSignal(str, object, name='portOpened')
+    DeviceLost = QSignal(str, name='deviceLost')
+    DeviceMissing = QSignal(str, name='deviceMissing')
+
+    def __init__(self, interval=1.0, max_interval=10.0):
+        super().__init__()
+        self._interval = interval
+        self._max_interval = max_interval
+        self._opener = mido.open_input
+        self._lock = Lock()
+        self._wake = Event()
+        self._thread = None
+        self._running = False
+        self._watched = set()
+        self._connected = set()
+        self._reported_missing = set()
+
+        self._poll_count = 0
+        self._poll_time = 0.0
+        self._last_poll_time = 0.0
+
+    @property
+    def stats(self):
+        """Cost of polling the MIDI backend, in seconds."""
+        return {
+            'polls': self._poll_count,
+            'total_time': self._poll_time,
+            'mean_time': self._poll_time / self._poll_count if self._poll_count else 0.0,
+            'last_time': self._last_poll_time,
+        }
+
+    def _poll(self):
+        start = perf_counter()
+        try:
+            present = set(mido.get_input_names())
+        except (IOError, RuntimeError):
+            present = set()
+        elapsed = perf_counter() - start
+        self._poll_count += 1
+        self._poll_time += elapsed
+        self._last_poll_time = elapsed
+
+        with self._lock:
+            watched = self._watched
+            connected = self._connected
+
+        all_present = True
+        for name in connected - present:
+            with self._lock:
+                self._connected.discard(name)
+            self._reported_missing.add(name)
+            self.DeviceLost.emit(name)
+            connected = connected - {name}
+
+        for name in watched - connected:
+            port = None
+            if name in present:
+                try:
+                    port = self._opener(name)
+                except IOError:
+                    pass
+
+            if not port:
+                all_present = False
+                if name not in self._reported_missing:
+                    self._reported_missing.add(name)
+                    self.DeviceMissing.emit(name)
+                continue
+
+            with self._lock:
+                if name not in self._watched:
+                    port.close()
+                    continue
+                self._connected.add(name)
+            self._reported_missing.discard(name)
+            self.PortOpened.emit(name, port)
+
+        return all_present
+
+    def _run(self):
+        interval = self._interval
+        while self._running:
+            if self._poll():
+                interval = self._interval
+            else:
+                interval = min(interval * 2, self._max_interval)
+            self._wake.wait(interval)
+            self._wake.clear()
+
+    def set_intervals(self, interval, max_interval):
+        self._interval = interval
+        self._max_interval = max(interval, max_interval)
+        self._wake.set()
+
+    def set_opener(self, opener):
+        self._opener = opener
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        self._wake.set()
+
+    def watch(self, names, connected=()):
+        """Sets the devices to watch, and which of them are (already) open."""
+        with self._lock:
+            self._watched = set(names)
+            self._connected = set(connected) & self._watched
+            self._reported_missing = set()
+        self._wake.set()
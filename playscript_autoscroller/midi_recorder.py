@@ -0,0 +1,113 @@
+"""
+MIDI session logs.
+
+A log is a short header followed by fixed-width records, one per received message:
+* time of arrival, in seconds since the recording started (little-endian double),
+* message length in bytes (1 - 3),
+* the message bytes (zero padded),
+* padding, to keep records 16-byte aligned.
+
+Messages longer than three bytes (i.e. SysEx) are not recorded.
+"""
+
+import mmap
+from struct import Struct
+from threading import Event, Lock, Thread
+from time import monotonic, perf_counter
+
+
+SESSION_FILE_TYPE = ('MIDI Session Logs (*.midilog)', '.midilog')
+
+HEADER = b'PSAMIDI\x01'
+RECORD = Struct('<dB3B4x')
+
+
+class MidiRecorder:
+
+    def __init__(self, filename):
+        self._lock = Lock()
+        self._file = open(filename, mode='wb') # pylint: disable=consider-using-with
+        self._file.write(HEADER)
+        self._start = perf_counter()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    def record(self, data, arrival=None):
+        """May be called from any thread. `arrival` is by `time.perf_counter`."""
+        length = len(data)
+        if length > 3:
+            return
+        padded = (*data, 0, 0, 0)
+        record = RECORD.pack(
+            (arrival or perf_counter()) - self._start, length, padded[0], padded[1], padded[2])
+
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(record)
+
+
+class MidiLog:
+    """Read-only, memory-mapped view of a recorded session."""
+
+    def __init__(self, filename):
+        with open(filename, mode='rb') as filehandle:
+            if filehandle.read(len(HEADER)) != HEADER:
+                raise ValueError(f"{filename} is not a MIDI session log")
+            size = filehandle.seek(0, 2)
+            self._map = mmap.mmap(filehandle.fileno(), 0, access=mmap.ACCESS_READ) \
+                if size > len(HEADER) else None
+
+    def __iter__(self):
+        end = len(HEADER) + len(self) * RECORD.size
+        for offset in range(len(HEADER), end, RECORD.size):
+            timestamp, length, *data = RECORD.unpack_from(self._map, offset)
+            yield timestamp, data[:length]
+
+    def __len__(self):
+        if not self._map:
+            return 0
+        return (len(self._map) - len(HEADER)) // RECORD.size
+
+    def close(self):
+        if self._map:
+            self._map.close()
+            self._map = None
+
+
+class MidiReplay(Thread):
+    """
+    Feeds a recorded session to `callback`, from a background thread (as a MIDI backend would).
+
+    The session may be replayed at the speed it was recorded (`speed=1`), at a multiple of
+    that speed, or as fast as possible (`speed=0`).
+
+    `on_finished`, if given, is called with the replay once it has finished (or been stopped).
+    """
+
+    def __init__(self, filename, callback, speed=1, on_finished=None):
+        super().__init__(daemon=True)
+        self._log = MidiLog(filename)
+        self._callback = callback
+        self._on_finished = on_finished
+        self._speed = speed
+        self._stop_event = Event()
+
+    def run(self):
+        start = monotonic()
+        for timestamp, data in self._log:
+            if self._speed:
+                delay = start + timestamp / self._speed - monotonic()
+                if delay > 0 and self._stop_event.wait(delay):
+                    break
+            elif self._stop_event.is_set():
+                break
+            self._callback(data)
+
+        self._log.close()
+        if self._on_finished:
+            self._on_finished(self)
+
+    def stop(self):
+        self._stop_event.set()
@@ -3,55 +3,236 @@ import mido
 
 from qtpy.QtCore import QObject, Signal as QSignal
 
+from .control_slots import ControlSlots
+from .input_filters import create_filter
+from .latency import LatencyMonitor
+from .midi_bindings import (
+    MIDPOINT_SLOT,
+    SCROLL_SLOT,
+    bound_statuses,
+    compile_bindings,
+    configured_bindings,
+    dispatch,
+    scroll_resolution,
+    unusable_bindings,
+)
+from .midi_event_queue import MidiEventQueue
+from .midi_hotplug import HotplugMonitor
+from .midi_recorder import MidiRecorder, MidiReplay
+from .rtmidi_input import RTMIDI_SUPPORT, RtMidiInput, open_input as rtmidi_open_input
 from .ui.midi_config import MidiConfigDialog
 
 
 class MidiRunner(QObject):
 
     ConfigKey = 'midi'
+    # Scroll values are of 14-bit resolution, whatever the source. See `.high_resolution`.
     ScrollUpdate = QSignal(int, name='scrollUpdate')
     MidpointUpdate = QSignal(int, name='midpointUpdate')
     PauseToggled = QSignal(name='pauseToggled')
     IgnoreToggled = QSignal(name='ignoreToggled')
+    NextHeading = QSignal(name='nextHeading')
+    PreviousHeading = QSignal(name='previousHeading')
+    ZoomIn = QSignal(name='zoomIn')
+    ZoomOut = QSignal(name='zoomOut')
+    FiltersChanged = QSignal(object, object, int, name='filtersChanged')
+    ReplayFinished = QSignal(object, name='replayFinished')
 
     def __init__(self, application):
         super().__init__()
         self._application = application
-        self._port = None
+        self._ports = {}
+        self._events = MidiEventQueue(self.on_midi_event)
+        self._slots = ControlSlots(2)
+        self._arrival = 0.0
+        self._slot_arrivals = [0.0, 0.0]
+        self._latency = LatencyMonitor()
+        self._recorder = None
+        self._replay = None
+        self._dispatch = {}
+        self._statuses = frozenset()
+
+        self._hotplug = HotplugMonitor()
+        self._hotplug.portOpened.connect(self.on_port_opened)
+        self._hotplug.deviceLost.connect(self.on_device_lost)
+        self._hotplug.deviceMissing.connect(self.on_device_missing)
 
         self._config_dialog = None
         self._config_getter = self._application.register_config(
             self.ConfigKey, MidiConfigDialog.Defaults)
-        self._config = self._config_getter()
+        self._config = self._get_config()
+        self._update_bindings()
+        self._update_backend()
+        self._update_hotplug()
 
         self._application.config_restored.connect(self.restore_from_config)
+        self.ReplayFinished.connect(self.on_replay_finished)
+
+    def _get_config(self):
+        # Fill in any options added since the config file was last written.
+        return {**MidiConfigDialog.Defaults, **self._config_getter()}
+
+    def _update_bindings(self):
+        # Compiled in full before being swapped in, so the MIDI thread never sees a partial table.
+        dispatch_table = compile_bindings(
+            configured_bindings(self._config),
+            self._store,
+            {
+                'pause': self.PauseToggled.emit,
+                'ignore': self.IgnoreToggled.emit,
+                'next_heading': self.NextHeading.emit,
+                'previous_heading': self.PreviousHeading.emit,
+                'zoom_in': self.ZoomIn.emit,
+                'zoom_out': self.ZoomOut.emit,
+            })
+        self._statuses = bound_statuses(dispatch_table)
+        self._dispatch = dispatch_table
+
+    def _update_backend(self):
+        use_rtmidi = self._config['input_backend'] == 'rtmidi' and RTMIDI_SUPPORT
+        self._hotplug.set_opener(rtmidi_open_input if use_rtmidi else mido.open_input)
+
+    def _update_hotplug(self):
+        self._hotplug.set_intervals(
+            self._config['hotplug_interval'] / 1000, self._config['hotplug_max_interval'] / 1000)
+
+    def _check_bindings(self):
+        unusable = unusable_bindings(configured_bindings(self._config))
+        if unusable:
+            self._application.window.show_status_message(
+                f"Ignoring {len(unusable)} MIDI binding(s) to a type of message their action "
+                "can't use!")
+
+    def _update_filters(self):
+        self.FiltersChanged.emit(
+            create_filter(self._config['scroll_filter'], self._config['scroll_filter_amount']),
+            create_filter(self._config['midpoint_filter'], self._config['midpoint_filter_amount']),
+            scroll_resolution(configured_bindings(self._config)))
+
+    def _devices(self):
+        devices = [self._config['device']] if self._config['device'] else []
+        for device in self._config.get('additional_devices', []):
+            if device not in devices:
+                devices.append(device)
+        return devices
+
+    def _store(self, slot, value):
+        self._slot_arrivals[slot] = self._arrival
+        self._slots.store(slot, value)
 
-    def on_midi_message(self, message):
-        if message.channel != self._config['channel']:
+    @property
+    def device_stats(self):
+        """Throughput and latency of each device (and of any replay), from `MidiEventQueue`."""
+        return self._events.stats
+
+    @property
+    def hotplug_stats(self):
+        return self._hotplug.stats
+
+    @property
+    def latency(self):
+        return self._latency
+
+    def diagnostics(self):
+        """Latency, device and hot-plug statistics, in seconds."""
+        return {
+            'latency': self._latency.summary(),
+            'devices': self.device_stats,
+            'hotplug': self.hotplug_stats,
+        }
+
+    def close_port(self, name):
+        port = self._ports.pop(name, None)
+        if port:
+            port.callback = None
+            port.close()
+
+    def on_device_lost(self, name):
+        if name not in self._ports:
             return
+        self.close_port(name)
+        self._application.window.show_status_message(
+            f"MIDI Device {name} disconnected! Waiting for it to be reconnected...")
+
+    def on_device_missing(self, name):
+        self._application.window.show_status_message(
+            f"MIDI Device {name} not connected!")
 
-        if message.type == 'control_change':
-            if message.control == self._config['scroll_control']:
-                self.ScrollUpdate.emit(message.value)
-            elif message.control == self._config['midpoint_control']:
-                self.MidpointUpdate.emit(message.value)
+    def on_port_opened(self, name, port):
+        if name not in self._devices() or name in self._ports:
+            port.close()
             return
 
-        if message.type == 'note_on':
-            if message.note == self._config['ignore_note']:
-                self.IgnoreToggled.emit()
-            elif message.note == self._config['pause_note']:
-                self.PauseToggled.emit()
+        def on_data(data):
+            # Drop anything that isn't bound to, unless it's wanted for a recording.
+            if data[0] in self._statuses or self._recorder:
+                self._events.put(name, data)
+
+        self._ports[name] = port
+        if isinstance(port, RtMidiInput):
+            port.callback = on_data
+        else:
+            port.callback = lambda message: on_data(message.bytes())
+        self._application.window.show_status_message(
+            "Started MIDI Runner" if len(self._ports) == 1 else f"Opened MIDI Device {name}")
+
+    def on_midi_bytes(self, data):
+        self._events.put('replay', data)
+
+    def on_midi_event(self, _, arrival, data):
+        recorder = self._recorder
+        if recorder:
+            recorder.record(data, arrival)
+        self._arrival = arrival
+        dispatch(self._dispatch, self._statuses, data)
+        self._latency.record('dispatch', arrival)
+
+    def poll(self, _=None):
+        """Called from the GUI thread, once per frame, to pass on the latest control values."""
+        value = self._slots.take(SCROLL_SLOT)
+        if value is not None:
+            arrival = self._slot_arrivals[SCROLL_SLOT]
+            self._latency.record('frame', arrival)
+            self._latency.expect('scroll', arrival)
+            self.ScrollUpdate.emit(value)
+
+        value = self._slots.take(MIDPOINT_SLOT)
+        if value is not None:
+            self._latency.record('frame', self._slot_arrivals[MIDPOINT_SLOT])
+            self.MidpointUpdate.emit(value)
+
+    def on_replay_finished(self, replay):
+        # A replay since stopped (and perhaps replaced) has already been dealt with.
+        if replay is not self._replay:
+            return
+        self._replay = None
+        self._application.window.show_status_message(
+            "MIDI Session replay finished")
+
+    def reset_diagnostics(self):
+        self._latency.reset()
+        self._events.reset_stats()
 
     def restore_from_config(self):
-        self._config = self._config_getter()
+        self._config = self._get_config()
+        self._update_bindings()
+        self._update_backend()
+        self._update_hotplug()
+        self._update_filters()
         self.start()
+        self._check_bindings()
 
     def on_config_change(self):
-        last_device = self._config['device']
+        last_devices = self._devices()
+        last_backend = self._config['input_backend']
         self._application.save_config(self.ConfigKey, self._config_dialog.serialise())
-        self._config = self._config_getter()
-        if self._config['device'] != last_device:
+        self._config = self._get_config()
+        self._update_bindings()
+        self._update_backend()
+        self._update_hotplug()
+        self._update_filters()
+        self._check_bindings()
+        if self._devices() != last_devices or self._config['input_backend'] != last_backend:
             self.stop()
             self.start()
 
@@ -64,23 +245,68 @@ class MidiRunner(QObject):
         self._config_dialog.show()
 
     def start(self):
+        # Devices are opened by the hotplug monitor, away from the GUI thread.
+        self._events.start()
+        devices = self._devices()
+        if devices:
+            self._hotplug.watch(devices)
+            self._hotplug.start()
+
+    def start_recording(self, filename):
+        """Returns whether recording could be started."""
+        self.stop_recording()
         try:
-            self._port = mido.open_input(self._config['device'])
-        except IOError:
+            self._recorder = MidiRecorder(filename)
+        except OSError:
             self._application.window.show_status_message(
-                "MIDI Device not connected!")
+                "Unable to write MIDI Session!")
+            return False
+
+        self._application.window.show_status_message(
+            "Recording MIDI Session")
+        return True
+
+    def start_replay(self, filename, speed=1):
+        self.stop_replay()
+        try:
+            self._replay = MidiReplay(
+                filename, self.on_midi_bytes, speed, on_finished=self.ReplayFinished.emit)
+        except (OSError, ValueError):
+            self._application.window.show_status_message(
+                "Unable to read MIDI Session!")
             return
 
-        self._port.callback = self.on_midi_message
+        self._events.start()
+        self._replay.start()
         self._application.window.show_status_message(
-            "Started MIDI Runner")
+            "Replaying MIDI Session")
 
     def stop(self):
-        if self._port:
-            self._port.callback = None
-            self._port.close()
+        self._hotplug.watch([])
+        if self._ports:
+            for name in list(self._ports):
+                self.close_port(name)
             self._application.window.show_status_message(
                 "Stopped MIDI Runner")
 
+    def stop_recording(self):
+        recorder = self._recorder
+        if recorder:
+            self._recorder = None
+            recorder.close()
+            self._application.window.show_status_message(
+                "Stopped recording MIDI Session")
+
+    def stop_replay(self):
+        replay = self._replay
+        if replay:
+            self._replay = None
+            replay.stop()
+            replay.join()
+
     def shutdown(self):
+        self._hotplug.stop()
+        self.stop_recording()
+        self.stop_replay()
         self.stop()
+        self._events.stop()
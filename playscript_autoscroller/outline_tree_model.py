@@ -190,6 +190,17 @@ class OutlineTreeModel(QAbstractItemModel):
         # pylint: disable=invalid-name
         return self.childCount(index)
 
+    def headings(self):
+        """All headings' indexes, in document order."""
+        indexes = []
+        def walk(parent_index):
+            for rownum in range(self.rowCount(parent_index)):
+                index = self.index(rownum, 0, parent_index)
+                indexes.append(index)
+                walk(index)
+        walk(QModelIndex())
+        return indexes
+
     def determine_outline(self, document):
         self.clear()
         block = document.firstBlock()
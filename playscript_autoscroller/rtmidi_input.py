@@ -0,0 +1,58 @@
+"""
+A lighter-weight alternative to opening MIDI inputs through mido.
+
+mido parses every message received into a `mido.Message` before handing it over, including
+the many that are of no interest here (clock, active sensing, messages on other channels).
+Ports opened here instead pass on each message's raw bytes, as given by python-rtmidi, and
+have rtmidi itself discard System Exclusive, clock and active sensing messages.
+"""
+
+try:
+    import rtmidi
+    RTMIDI_SUPPORT = True
+except ImportError:
+    RTMIDI_SUPPORT = False
+
+
+class RtMidiInput:
+    """
+    The subset of the interface of a mido input port used by `MidiRunner`.
+
+    `callback` is called with a list of the message's bytes, from rtmidi's thread.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.callback = None
+        self._midi_in = rtmidi.MidiIn()
+
+        port_names = self._midi_in.get_ports()
+        if name not in port_names:
+            self._midi_in.delete()
+            raise IOError(f"unknown port {name!r}")
+
+        try:
+            self._midi_in.open_port(port_names.index(name))
+        except RuntimeError as error:
+            self._midi_in.delete()
+            raise IOError(*error.args) from error
+
+        self._midi_in.ignore_types(sysex=True, timing=True, active_sense=True)
+        self._midi_in.set_callback(self._on_event)
+
+    def _on_event(self, event, _):
+        callback = self.callback
+        if callback:
+            callback(event[0])
+
+    def close(self):
+        self.callback = None
+        self._midi_in.cancel_callback()
+        self._midi_in.close_port()
+        self._midi_in.delete()
+
+
+def open_input(name):
+    if not RTMIDI_SUPPORT:
+        raise IOError("python-rtmidi is not available")
+    return RtMidiInput(name)
@@ -1,19 +1,54 @@
 
 from strictyaml import (
+    Bool,
     Datetime,
+    Enum,
     Int,
     Map,
+    Optional,
+    Seq,
     Str,
 )
 
+from .input_filters import FILTERS
+from .midi_bindings import ACTIONS, BINDING_TYPES
+from .velocity_curves import PROFILES
+
 """
 lastSave: [[ISO-8601 DateTime]]
 lastLocation: "/home/user"
 midpoint: 63
 midi:
   device: "DeviceName:PortName DeviceNum:PortNum"
+  additional_devices:
+  - "DeviceName:PortName DeviceNum:PortNum"
   channel: 1
   control: 7
+  hotplug_interval: 1000
+  hotplug_max_interval: 10000
+  input_backend: rtmidi
+  scroll_source: cc14
+  scroll_nrpn: 0
+  scroll_filter: one_euro
+  scroll_filter_amount: 2
+  bindings:
+  - action: next_heading
+    type: note
+    channel: 1
+    number: 4
+scroll_profile:
+  name: classic
+  max_speed: 440
+  dead_zone: 4
+  breakpoints:
+  - deflection: 10
+    speed: 20
+pdf_cache_size: 256
+pdf_disk_cache_size: 1024
+pdf_grayscale: no
+pdf_grayscale_palette: yes
+pdf_prefetch: 2
+pdf_render_server: no
 zoom_pdf: 100
 zoom_text: 2
 """
@@ -24,12 +59,43 @@ config_schema = Map({
     "midpoint": Int(),
     "midi": Map({
       "device": Str(),
+      Optional("additional_devices"): Seq(Str()),
       "channel": Int(),
       "scroll_control": Int(),
       "midpoint_control": Int(),
       "ignore_note": Int(),
       "pause_note": Int(),
+      Optional("hotplug_interval"): Int(),
+      Optional("hotplug_max_interval"): Int(),
+      Optional("input_backend"): Enum(["mido", "rtmidi"]),
+      Optional("scroll_source"): Enum(["cc", "cc14", "nrpn", "pitchwheel"]),
+      Optional("scroll_nrpn"): Int(),
+      Optional("scroll_filter"): Enum(list(FILTERS)),
+      Optional("scroll_filter_amount"): Int(),
+      Optional("midpoint_filter"): Enum(list(FILTERS)),
+      Optional("midpoint_filter_amount"): Int(),
+      Optional("bindings"): Seq(Map({
+        "action": Enum(list(ACTIONS)),
+        "type": Enum(list(BINDING_TYPES)),
+        Optional("channel"): Int(),
+        "number": Int(),
+      })),
+    }),
+    Optional("scroll_profile"): Map({
+      "name": Enum(list(PROFILES)),
+      "max_speed": Int(),
+      "dead_zone": Int(),
+      Optional("breakpoints"): Seq(Map({
+        "deflection": Int(),
+        "speed": Int(),
+      })),
     }),
+    Optional("pdf_cache_size"): Int(),
+    Optional("pdf_disk_cache_size"): Int(),
+    Optional("pdf_grayscale"): Bool(),
+    Optional("pdf_grayscale_palette"): Bool(),
+    Optional("pdf_prefetch"): Int(),
+    Optional("pdf_render_server"): Bool(),
     "zoom_pdf": Int(),
     "zoom_text": Int(),
 })
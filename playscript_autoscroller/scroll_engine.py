@@ -0,0 +1,84 @@
+from time import monotonic
+
+from qtpy.QtCore import QObject, Qt, QTimer, Signal as QSignal
+
+
+class ScrollEngine(QObject):
+    """
+    Moves the displayed content at a given velocity, once per display frame.
+
+    The velocity (in pixels per second) is integrated against a monotonic clock, so the
+    distance travelled depends only on the time that has passed, not on how punctually the
+    timer fires. Fractions of a pixel are carried over from one frame to the next.
+
+    Frames are timed against deadlines a whole (unrounded) frame period apart, rather than by
+    a fixed interval in whole milliseconds, so that over time they keep pace with the display
+    (16 and 17 ms apart at 60 Hz, say, rather than always 16).
+    """
+
+    DefaultFrameRate = 60
+    # Cap on the time a single frame may account for, so that (for instance) resuming from
+    # a suspended machine doesn't throw the reader several pages down the script.
+    MaxFrameTime = 0.25 # s
+
+    FrameStarted = QSignal(float, name='frameStarted')
+
+    def __init__(self, velocity_source, scroll_target, parent=None):
+        super().__init__(parent)
+        self._velocity_source = velocity_source
+        self._scroll_target = scroll_target
+        self._last_frame = None
+        self._next_frame = None
+        self._frame_period = 1 / self.DefaultFrameRate
+        self._remainder = 0.0
+
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.tick)
+        self.set_frame_rate(self.DefaultFrameRate)
+
+    @property
+    def active(self):
+        return self._next_frame is not None
+
+    def set_frame_rate(self, frame_rate):
+        if not frame_rate or frame_rate <= 0:
+            frame_rate = self.DefaultFrameRate
+        self._frame_period = 1 / frame_rate
+
+    def start(self):
+        self._last_frame = monotonic()
+        self._next_frame = self._last_frame + self._frame_period
+        self._remainder = 0.0
+        self._schedule()
+
+    def stop(self):
+        self._next_frame = None
+        self._timer.stop()
+
+    def _schedule(self):
+        delay = self._next_frame - monotonic()
+        self._timer.start(max(0, round(delay * 1000)))
+
+    def tick(self):
+        now = monotonic()
+        elapsed = min(now - self._last_frame, self.MaxFrameTime)
+        self._last_frame = now
+        # Frames missed altogether (the GUI thread was busy) are dropped, not caught up on.
+        self._next_frame += self._frame_period
+        if self._next_frame <= now:
+            self._next_frame = now + self._frame_period
+        self._schedule()
+        self.FrameStarted.emit(now)
+
+        velocity = self._velocity_source()
+        if not velocity:
+            self._remainder = 0.0
+            return
+
+        distance = velocity * elapsed + self._remainder
+        step = int(distance)
+        self._remainder = distance - step
+        if step:
+            self._scroll_target(step)
@@ -0,0 +1,132 @@
+from .high_resolution import STEP, from_7bit
+from .input_filters import NullFilter
+from .velocity_curves import VelocityCurve
+
+
+class ScrollModel:
+    """
+    The state of the scroller, independent of any widget that might display it.
+
+    Every change of state increments `revision`, so that observers may check (once per
+    frame, say) whether they have anything to repaint.
+
+    Values received from the MIDI device are smoothed by the input filters once per frame
+    (see `advance`); only when the (rounded) filtered value moves is anything recalculated.
+
+    The scroll value is held at 14-bit resolution; the midpoint at 7-bit resolution. The
+    input filters work in 7-bit steps, whatever the resolution of the value they filter, and
+    the filtered scroll value is rounded to the resolution of its source (`value_step`), so
+    that a 7-bit control doesn't seem to move on every frame as a filter settles.
+    """
+
+    def __init__(self, midpoint=63, profile=None):
+        self._curve = VelocityCurve(midpoint, profile)
+        self._value = from_7bit(midpoint)
+        self._input_value = self._value
+        self._input_midpoint = None
+        self._value_filter = NullFilter()
+        self._midpoint_filter = NullFilter()
+        self._value_step = STEP
+        self._paused = True
+        self._ignored = False
+        self._velocity = 0.0
+        self.revision = 0
+
+    @property
+    def ignored(self):
+        return self._ignored
+
+    @property
+    def midpoint(self):
+        return self._curve.midpoint
+
+    @property
+    def paused(self):
+        return self._paused
+
+    @property
+    def profile(self):
+        return self._curve.profile
+
+    @property
+    def value(self):
+        return self._value
+
+    def _move_midpoint(self, midpoint):
+        if midpoint == self._curve.midpoint:
+            return
+        self._curve.set_midpoint(midpoint)
+        self._changed()
+
+    def _changed(self):
+        # Whilst input is being ignored, keep scrolling at the speed we were going.
+        if not self._ignored:
+            self._velocity = self._curve.velocity(self._value)
+        self.revision += 1
+
+    def advance(self, now):
+        """Runs the input filters; called once per frame."""
+        filtered = self._value_filter.update(self._input_value / STEP, now) * STEP
+        value = round(filtered / self._value_step) * self._value_step
+        if value != self._value:
+            self._value = value
+            self._changed()
+
+        if self._input_midpoint is not None:
+            self._move_midpoint(round(self._midpoint_filter.update(self._input_midpoint, now)))
+
+    def input_midpoint(self, midpoint):
+        self._input_midpoint = midpoint
+
+    def input_value(self, value):
+        if not self._ignored:
+            self._input_value = value
+
+    def set_filters(self, value_filter, midpoint_filter, value_step=STEP):
+        """`value_step` is the step, at 14-bit resolution, that the scroll control moves in."""
+        value_filter.reset(self._value / STEP)
+        midpoint_filter.reset(self.midpoint)
+        self._value_filter = value_filter
+        self._midpoint_filter = midpoint_filter
+        self._value_step = value_step
+
+    def set_ignored(self, ignored):
+        if ignored == self._ignored:
+            return
+        self._ignored = ignored
+        self._changed()
+
+    def set_midpoint(self, midpoint):
+        self._input_midpoint = None
+        self._midpoint_filter.reset(midpoint)
+        self._move_midpoint(midpoint)
+
+    def set_paused(self, paused):
+        if paused == self._paused:
+            return
+        self._paused = paused
+        self._changed()
+
+    def set_profile(self, profile):
+        self._curve.set_profile(profile)
+        self._changed()
+
+    def set_value(self, value):
+        self._input_value = value
+        self._value_filter.reset(value / STEP)
+        if value == self._value:
+            return
+        self._value = value
+        self._changed()
+
+    def toggle_ignored(self):
+        self.set_ignored(not self._ignored)
+
+    def toggle_paused(self):
+        self.set_paused(not self._paused)
+
+    def velocity(self):
+        """Speed to scroll at, in pixels per second. Negative values scroll upwards."""
+        if self._paused:
+            return 0
+        return self._velocity
@@ -0,0 +1,156 @@
+from functools import partial
+
+from qtpy.QtWidgets import (
+    QAbstractItemView,
+    QComboBox,
+    QHBoxLayout,
+    QHeaderView,
+    QPushButton,
+    QSpinBox,
+    QTableWidget,
+    QVBoxLayout,
+    QWidget,
+)
+
+from ..midi_bindings import ACTIONS, BINDING_TYPES, binding_types
+
+
+class BindingsEditor(QWidget):
+    """Table of additional MIDI bindings, one row per binding."""
+
+    ActionNames = {
+        'scroll': 'Scroll',
+        'midpoint': 'Set Midpoint',
+        'pause': 'Pause',
+        'ignore': 'Ignore',
+        'next_heading': 'Next Heading',
+        'previous_heading': 'Previous Heading',
+        'zoom_in': 'Zoom In',
+        'zoom_out': 'Zoom Out',
+    }
+    TypeNames = {
+        'cc': 'Control Change',
+        'cc14': 'Control Change (14-bit)',
+        'nrpn': 'NRPN',
+        'pitchwheel': 'Pitch Bend',
+        'note': 'Note On',
+    }
+    # Highest control, note or NRPN number of each type; None where the number is ignored.
+    # The LSB of a 14-bit Control Change is sent 32 controls above its MSB.
+    NumberMaxima = {
+        'cc': 127,
+        'cc14': 31,
+        'nrpn': 16383,
+        'pitchwheel': None,
+        'note': 127,
+    }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.setLayout(QVBoxLayout())
+        self.layout().setContentsMargins(0, 0, 0, 0)
+
+        self._table = QTableWidget(0, 4, self)
+        self._table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self._table.verticalHeader().setVisible(False)
+        self._table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.layout().addWidget(self._table)
+
+        self._button_row = QHBoxLayout()
+        self._add_button = QPushButton(self)
+        self._add_button.clicked.connect(self.add_binding)
+        self._button_row.addWidget(self._add_button)
+        self._remove_button = QPushButton(self)
+        self._remove_button.clicked.connect(self.remove_binding)
+        self._button_row.addWidget(self._remove_button)
+        self._button_row.addStretch()
+        self.layout().addLayout(self._button_row)
+
+        self.retranslate_ui()
+
+    def add_binding(self, binding=None):
+        if not isinstance(binding, dict):
+            # Called from the "Add" button
+            binding = {'action': ACTIONS[0], 'type': BINDING_TYPES[0], 'number': 0}
+
+        row = self._table.rowCount()
+        self._table.insertRow(row)
+
+        action_selector = QComboBox(self._table)
+        for action in ACTIONS:
+            action_selector.addItem(self.ActionNames[action], action)
+        action_selector.setCurrentIndex(action_selector.findData(binding['action']))
+        self._table.setCellWidget(row, 0, action_selector)
+
+        type_selector = QComboBox(self._table)
+        self.populate_types(action_selector, type_selector)
+        # A type the action can't use (in a hand-edited config) gives way to one it can.
+        type_selector.setCurrentIndex(max(0, type_selector.findData(binding['type'])))
+        self._table.setCellWidget(row, 1, type_selector)
+
+        channel_selector = QSpinBox(self._table)
+        # Zero stands for the dialog's "MIDI Channel"
+        channel_selector.setRange(0, 16)
+        channel_selector.setSpecialValueText('Default')
+        channel_selector.setValue(binding['channel'] + 1 if 'channel' in binding else 0)
+        self._table.setCellWidget(row, 2, channel_selector)
+
+        number_selector = QSpinBox(self._table)
+        self.on_type_change(type_selector, number_selector)
+        number_selector.setValue(binding['number'])
+        self._table.setCellWidget(row, 3, number_selector)
+        type_selector.currentIndexChanged.connect(
+            partial(self.on_type_change, type_selector, number_selector))
+        action_selector.currentIndexChanged.connect(
+            partial(self.on_action_change, action_selector, type_selector, number_selector))
+
+    def deserialise(self, bindings):
+        self._table.setRowCount(0)
+        for binding in bindings:
+            self.add_binding(binding)
+
+    def on_action_change(self, action_selector, type_selector, number_selector):
+        self.populate_types(action_selector, type_selector)
+        self.on_type_change(type_selector, number_selector)
+
+    def on_type_change(self, type_selector, number_selector):
+        maximum = self.NumberMaxima[type_selector.currentData()]
+        number_selector.setRange(0, maximum or 0)
+        number_selector.setEnabled(maximum is not None)
+
+    def populate_types(self, action_selector, type_selector):
+        """Offers only the message types the action can be bound to, keeping the current one."""
+        current_type = type_selector.currentData()
+        type_selector.blockSignals(True)
+        type_selector.clear()
+        for binding_type in binding_types(action_selector.currentData()):
+            type_selector.addItem(self.TypeNames[binding_type], binding_type)
+        type_selector.setCurrentIndex(max(0, type_selector.findData(current_type)))
+        type_selector.blockSignals(False)
+
+    def remove_binding(self):
+        rows = {index.row() for index in self._table.selectionModel().selectedRows()}
+        if not rows and self._table.currentRow() > -1:
+            rows = {self._table.currentRow()}
+        for row in sorted(rows, reverse=True):
+            self._table.removeRow(row)
+
+    def retranslate_ui(self):
+        self._table.setHorizontalHeaderLabels(['Action', 'Message Type', 'Channel', '#'])
+        self._add_button.setText('Add Binding')
+        self._remove_button.setText('Remove Binding')
+
+    def serialise(self):
+        bindings = []
+        for row in range(self._table.rowCount()):
+            binding = {
+                'action': self._table.cellWidget(row, 0).currentData(),
+                'type': self._table.cellWidget(row, 1).currentData(),
+                'number': self._table.cellWidget(row, 3).value(),
+            }
+            channel = self._table.cellWidget(row, 2).value()
+            if channel:
+                binding['channel'] = channel - 1
+            bindings.append(binding)
+        return bindings
@@ -11,24 +11,32 @@ from qtpy.QtWidgets import (
     QWidget,
 )
 
+from ..high_resolution import MAXIMUM, from_7bit
+from ..velocity_curves import VelocityCurve
 from .palette_icon_engine import PaletteIconEngine
 
 
 class Controller(QWidget):
 
     Default = 63
+    ProfileConfigKey = 'scroll_profile'
 
-    def __init__(self, application, *args, **kwargs):
+    def __init__(self, application, model, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
         self._application = application
         self._config_getter = self._application.register_config('midpoint', self.Default)
-        self._cached_value = (0, 100)
+        self._profile_getter = self._application.register_config(
+            self.ProfileConfigKey, VelocityCurve.DefaultProfile)
+
+        self._model = model
+        self._model.set_profile(self._profile_getter())
+        self._painted_revision = None
 
         self.setLayout(QGridLayout())
 
         self._status = QProgressBar(self)
-        self._status.setRange(0, 127)
+        self._status.setRange(0, MAXIMUM)
         self._status.setTextVisible(False)
         self.layout().addWidget(self._status, 0, 0)
 
@@ -54,7 +62,7 @@ class Controller(QWidget):
         self._ignore_button.setChecked(False)
         self._ignore_button.setIcon(_ignore_icon)
         self._ignore_button.setStyleSheet(button_style)
-        self._ignore_button.pressed.connect(self.on_ignore)
+        self._ignore_button.toggled.connect(self._model.set_ignored)
         self.layout().addWidget(self._ignore_button, 0, 1)
 
         _pause_icon = QIcon(PaletteIconEngine(self.palette))
@@ -64,38 +72,50 @@ class Controller(QWidget):
         self._pause_button.setChecked(True)
         self._pause_button.setIcon(_pause_icon)
         self._pause_button.setStyleSheet(button_style)
+        self._pause_button.toggled.connect(self._model.set_paused)
         self.layout().addWidget(self._pause_button, 1, 1)
 
         # Default position
-        self.midpoint = self.Default
+        self._midpoint.setValue(self._model.midpoint)
+        self.refresh()
 
         self._application.config_restored.connect(self.deserialise)
+        self._midpoint.valueChanged.connect(self._model.set_midpoint)
         self._midpoint.valueChanged.connect(self.serialise)
 
-        runner = self._application.runner
-        runner.ignoreToggled.connect(self.toggle_ignore)
-        runner.midpointUpdate.connect(self.update_midpoint)
-        runner.pauseToggled.connect(self.toggle_pause)
-        runner.scrollUpdate.connect(self.update_scroll)
-
     @property
     def midpoint(self):
         """Value that is the midpoint of the input."""
-        return self._midpoint.value()
+        return self._model.midpoint
 
     @midpoint.setter
     def midpoint(self, new_midpoint):
-        self._midpoint.setValue(new_midpoint)
-        self._status.setValue(new_midpoint)
+        self._model.set_midpoint(new_midpoint)
+        self._model.set_value(from_7bit(new_midpoint))
+        self.refresh()
 
-    def on_ignore(self):
-        self._status.setEnabled(
-            self._ignore_button.isChecked())
+    def refresh(self, _=None):
+        """Brings the widgets in line with the model; called once per frame."""
+        if self._model.revision == self._painted_revision:
+            return
+        self._painted_revision = self._model.revision
+
+        self._status.setValue(self._model.value)
+        self._status.setEnabled(not self._model.ignored)
+        if self._midpoint.value() != self._model.midpoint:
+            # Don't feed the value back into the model: it'd reset the midpoint's input filter.
+            self._midpoint.blockSignals(True)
+            self._midpoint.setValue(self._model.midpoint)
+            self._midpoint.blockSignals(False)
+            self.serialise(self._model.midpoint)
+        self._ignore_button.setChecked(self._model.ignored)
+        self._pause_button.setChecked(self._model.paused)
 
     def serialise(self, new_midpoint):
         self._application.save_config('midpoint', new_midpoint)
 
     def deserialise(self):
+        self._model.set_profile(self._profile_getter())
         self.midpoint = self._config_getter()
 
     def retranslate_ui(self):
@@ -106,34 +126,3 @@ class Controller(QWidget):
         self._pause_button.setText('&Pause')
         self._pause_button.setToolTip('Pause scrolling')
         self._pause_button.setShortcut('Ctrl+P')
-
-    def toggle_ignore(self):
-        self._ignore_button.setChecked(
-            not self._ignore_button.isChecked())
-
-    def toggle_pause(self):
-        self._pause_button.setChecked(
-            not self._pause_button.isChecked())
-
-    def update_midpoint(self, new_value):
-        self._midpoint.setValue(new_value)
-
-    def update_scroll(self, new_value):
-        if self._ignore_button.isChecked():
-            return
-        self._status.setValue(new_value)
-
-    def value(self):
-
-        if self._pause_button.isChecked():
-            return (0, 100)
-
-        if self._ignore_button.isChecked():
-            return self._cached_value
-
-        diff = self._status.value() - self._midpoint.value()
-        self._cached_value = (
-            round(diff / 6),
-            round(1000 / (abs(diff / 2) + 10))
-        )
-        return self._cached_value
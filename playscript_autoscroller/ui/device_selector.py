@@ -1,36 +1,106 @@
-
+from qtpy.QtCore import Qt
 from qtpy.QtGui import QStandardItem
 from qtpy.QtWidgets import QComboBox
 
-from playscript_autoscroller.midi_devices import MidiDevices
+DEVICE_ROLE = Qt.UserRole + 1
+NOT_CONNECTED_ROLE = Qt.UserRole + 2
 
 
 class DeviceSelector(QComboBox):
-    def __init__(self, *args, **kwargs):
+    """
+    Choice of MIDI input port, grouped by device.
+
+    The ports are those of a `MidiDevices` cache that may be shared between selectors; its
+    owner passes each change to it on to `update_ports`.
+    """
+
+    def __init__(self, device_list, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.device_list = MidiDevices()
+        self.device_list = device_list
+        self._wanted = None
+
+        self.activated.connect(self.on_activated)
+
+    def _device_rows(self, device_key):
+        model = self.model()
+        return [
+            row for row in range(model.rowCount())
+            if model.item(row).data(DEVICE_ROLE) == device_key
+        ]
 
-    def add_subheader(self, caption):
+    def add_port(self, port):
+        device_key = str(port.device_num)
+        rows = self._device_rows(device_key)
+        if not rows:
+            self.add_subheader(self.device_list.device(port.device_num).ui_name, device_key)
+            rows = self._device_rows(device_key)
+
+        new_item = QStandardItem(port.ui_name)
+        new_item.setData(port.mido_name, Qt.UserRole)
+        new_item.setData(device_key, DEVICE_ROLE)
+        self.model().insertRow(rows[-1] + 1, new_item)
+
+    def add_subheader(self, caption, device_key=None):
         new_item = QStandardItem(caption)
         new_item.setEnabled(False)
+        new_item.setData(device_key, DEVICE_ROLE)
         font = new_item.font()
         font.setBold(True)
         new_item.setFont(font)
         self.model().appendRow(new_item)
 
-    def refresh(self):
-        self.device_list.refresh()
-        self.clear()
+    def add_not_connected(self, mido_name):
+        new_item = QStandardItem(f"{mido_name} (not connected)")
+        new_item.setEnabled(False)
+        new_item.setData(mido_name, Qt.UserRole)
+        new_item.setData(True, NOT_CONNECTED_ROLE)
+        self.model().appendRow(new_item)
 
-        for dev in self.device_list.devices():
-            self.add_subheader(dev.ui_name)
-            for port in dev.in_ports:
-                self.addItem(port.ui_name, port.mido_name)
+    def on_activated(self, idx):
+        self._wanted = self.itemData(idx)
+
+    def remove_not_connected(self):
+        model = self.model()
+        for row in reversed(range(model.rowCount())):
+            if model.item(row).data(NOT_CONNECTED_ROLE):
+                model.removeRow(row)
+
+    def update_ports(self, added, removed):
+        """Updates the list with the ports added to and removed from the device list."""
+        self.remove_not_connected()
+
+        for port in removed:
+            self.model().removeRow(self.findData(port.mido_name))
+            device_key = str(port.device_num)
+            rows = self._device_rows(device_key)
+            if len(rows) == 1:
+                # Only the subheader is left
+                self.model().removeRow(rows[0])
+
+        for port in added:
+            self.add_port(port)
+
+        self.select_wanted()
+
+    def select_wanted(self):
+        if not self._wanted:
+            self.remove_not_connected()
+            self.setCurrentIndex(-1)
+            return
+        idx = self.findData(self._wanted)
+        if idx < 0:
+            # Shown, though it can't be chosen, so the configured device isn't mistaken for
+            # no device at all.
+            self.remove_not_connected()
+            self.add_not_connected(self._wanted)
+            idx = self.count() - 1
+        self.setCurrentIndex(idx)
 
     def setValue(self, new_value):
         # pylint: disable=invalid-name
-        idx = self.findData(new_value)
-        self.setCurrentIndex(idx)
+        self._wanted = new_value
+        self.select_wanted()
 
     def value(self):
-        return self.itemData(self.currentIndex())
+        # A configured device that isn't currently connected remains the selected one.
+        return self._wanted
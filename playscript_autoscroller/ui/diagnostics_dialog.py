@@ -0,0 +1,211 @@
+import json
+from datetime import datetime
+from os import path
+
+from qtpy.QtCore import QTimer
+from qtpy.QtWidgets import (
+    QDialog,
+    QDialogButtonBox,
+    QFileDialog,
+    QGroupBox,
+    QHeaderView,
+    QLabel,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+)
+
+from playscript_autoscroller import __version__
+from ..latency import STAGES
+
+
+class DiagnosticsDialog(QDialog):
+    """
+    Live view of input latency, MIDI device and PDF rendering statistics; may be saved as
+    JSON.
+    """
+
+    RefreshInterval = 500 # ms
+    LatencyColumns = ('count', 'mean', 'p50', 'p95', 'p99', 'max')
+    DeviceColumns = ('messages', 'rate', 'mean_latency', 'max_latency')
+
+    def __init__(self, application, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._application = application
+
+        self.setLayout(QVBoxLayout())
+        self.resize(640, 480)
+
+        self._latency_group = QGroupBox(self)
+        self._latency_group.setLayout(QVBoxLayout())
+        self.layout().addWidget(self._latency_group)
+
+        self._latency_table = QTableWidget(len(STAGES), len(self.LatencyColumns), self)
+        self._latency_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self._latency_group.layout().addWidget(self._latency_table)
+
+        self._devices_group = QGroupBox(self)
+        self._devices_group.setLayout(QVBoxLayout())
+        self.layout().addWidget(self._devices_group)
+
+        self._devices_table = QTableWidget(0, len(self.DeviceColumns), self)
+        self._devices_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self._devices_group.layout().addWidget(self._devices_table)
+
+        self._hotplug_label = QLabel(self)
+        self._devices_group.layout().addWidget(self._hotplug_label)
+
+        self._cache_group = QGroupBox(self)
+        self._cache_group.setLayout(QVBoxLayout())
+        self.layout().addWidget(self._cache_group)
+
+        self._cache_label = QLabel(self)
+        self._cache_group.layout().addWidget(self._cache_label)
+
+        self._disk_cache_label = QLabel(self)
+        self._cache_group.layout().addWidget(self._disk_cache_label)
+
+        self._rendering_label = QLabel(self)
+        self._cache_group.layout().addWidget(self._rendering_label)
+
+        self._button_box = QDialogButtonBox(self)
+        self._reset_button = QPushButton(self)
+        self._reset_button.clicked.connect(self.reset)
+        self._button_box.addButton(self._reset_button, QDialogButtonBox.ResetRole)
+        self._export_button = QPushButton(self)
+        self._export_button.clicked.connect(self.export)
+        self._button_box.addButton(self._export_button, QDialogButtonBox.ActionRole)
+        self._button_box.addButton(QDialogButtonBox.Close)
+        self._button_box.rejected.connect(self.reject)
+        self.layout().addWidget(self._button_box)
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.RefreshInterval)
+        self._timer.timeout.connect(self.refresh)
+
+    def _diagnostics(self):
+        diagnostics = self._application.runner.diagnostics()
+        # Only some PDF views render pages themselves.
+        pdf_view = self._application.window.pdf_view
+        if hasattr(pdf_view, 'cache_stats'):
+            diagnostics['page_cache'] = pdf_view.cache_stats
+            diagnostics['page_disk_cache'] = pdf_view.disk_cache_stats
+            diagnostics['page_rendering'] = pdf_view.render_stats
+        return diagnostics
+
+    def export(self):
+        location = path.join(
+            self._application.window.get_valid_location(),
+            f"diagnostics-{datetime.now():%Y%m%d-%H%M%S}.json")
+        filename = QFileDialog.getSaveFileName(
+            self, "Export Diagnostics as...", location, 'JSON Files (*.json)')[0]
+        if not filename:
+            return
+
+        report = {
+            'generated': datetime.now().isoformat(),
+            'version': __version__,
+            'units': 'seconds',
+            **self._diagnostics(),
+        }
+        with open(filename, 'w', encoding='utf-8') as filehandle:
+            json.dump(report, filehandle, indent=2)
+
+    def hideEvent(self, event):
+        # pylint: disable=invalid-name
+        self._timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        diagnostics = self._diagnostics()
+
+        for row, stage in enumerate(STAGES):
+            summary = diagnostics['latency'][stage]
+            for column, key in enumerate(self.LatencyColumns):
+                text = str(summary[key]) if key == 'count' else f"{summary[key] * 1000:.2f}"
+                self._latency_table.setItem(row, column, QTableWidgetItem(text))
+
+        devices = diagnostics['devices']
+        self._devices_table.setRowCount(len(devices))
+        self._devices_table.setVerticalHeaderLabels(list(devices))
+        for row, stats in enumerate(devices.values()):
+            for column, key in enumerate(self.DeviceColumns):
+                if key == 'messages':
+                    text = str(stats[key])
+                elif key == 'rate':
+                    text = f"{stats[key]:.1f}"
+                else:
+                    text = f"{stats[key] * 1000:.2f}"
+                self._devices_table.setItem(row, column, QTableWidgetItem(text))
+
+        hotplug = diagnostics['hotplug']
+        self._hotplug_label.setText(
+            f"Device checks: {hotplug['polls']}, "
+            f"mean {hotplug['mean_time'] * 1000:.2f} ms, last {hotplug['last_time'] * 1000:.2f} ms")
+
+        cache = diagnostics.get('page_cache')
+        self._cache_group.setVisible(cache is not None)
+        if cache:
+            self._cache_label.setText(
+                f"In memory - hits: {cache['hits']}, misses: {cache['misses']}, "
+                f"evictions: {cache['evictions']}, tiles held: {cache['entries']}, "
+                f"size: {cache['size'] / 1048576:.1f} / {cache['budget'] / 1048576:.0f} MiB")
+
+        disk_cache = diagnostics.get('page_disk_cache')
+        self._disk_cache_label.setVisible(disk_cache is not None)
+        if disk_cache:
+            self._disk_cache_label.setText(
+                f"On disk - hits: {disk_cache['hits']}, misses: {disk_cache['misses']}, "
+                f"writes: {disk_cache['writes']}, pruned: {disk_cache['pruned']}, "
+                f"size: {disk_cache['size'] / 1048576:.1f} / "
+                f"{disk_cache['budget'] / 1048576:.0f} MiB")
+
+        rendering = diagnostics.get('page_rendering')
+        self._rendering_label.setVisible(rendering is not None)
+        if rendering:
+            self._rendering_label.setText('\n'.join(
+                f"{caption}: {stats['queued']} queued, {stats['rendered']} rendered, "
+                f"{stats['cancelled']} cancelled, mean {stats['mean_time'] * 1000:.1f} ms, "
+                f"max {stats['max_time'] * 1000:.1f} ms"
+                for caption, stats in (
+                    ('Draft pass', rendering['draft']),
+                    ('Full pass', rendering['full']),
+                )) + (
+                    f"\nRender server: {rendering['server']['workers']} workers, "
+                    f"{rendering['server']['crashes']} crashes, "
+                    f"{rendering['server']['failures']} failed renders"
+                    if rendering['server'] else '') + (
+                    f"\nGrayscale: {rendering['colour_pages']} pages found in colour"
+                    if rendering['colour_pages'] is not None else ''))
+
+    def reset(self):
+        self._application.runner.reset_diagnostics()
+        reset_pdf_stats = getattr(self._application.window.pdf_view, 'reset_stats', None)
+        if reset_pdf_stats:
+            reset_pdf_stats()
+        self.refresh()
+
+    def retranslate_ui(self):
+        self.setWindowTitle('Diagnostics')
+
+        self._latency_group.setTitle('Latency from MIDI Arrival (ms)')
+        self._latency_table.setHorizontalHeaderLabels(
+            ['Count', 'Mean', 'p50', 'p95', 'p99', 'Max'])
+        self._latency_table.setVerticalHeaderLabels(
+            ['Dispatched', 'Next Frame', 'Scrolled', 'Repainted'])
+
+        self._devices_group.setTitle('MIDI Devices')
+        self._devices_table.setHorizontalHeaderLabels(
+            ['Messages', 'Messages/s', 'Mean Latency (ms)', 'Max Latency (ms)'])
+
+        self._cache_group.setTitle('PDF Page Rendering')
+
+        self._reset_button.setText('Reset')
+        self._export_button.setText('Export...')
+
+    def showEvent(self, event):
+        # pylint: disable=invalid-name
+        self.refresh()
+        self._timer.start()
+        super().showEvent(event)
@@ -1,7 +1,7 @@
 
 import sys
 
-from qtpy.QtCore import Qt
+from qtpy.QtCore import QPoint, Qt
 from qtpy.QtGui import (
     QFont,
     QFontDatabase,
@@ -120,6 +120,10 @@ class MainText(QRstTextEdit):
         self.setFontMonospace(False)
         self.on_cursor_move()
 
+    def current_position(self):
+        """The position within the document of the text at the top of the viewport."""
+        return self.cursorForPosition(QPoint(0, 0)).position()
+
     def currentBlockFormat(self):
         # pylint: disable=invalid-name
         cursor = self.textCursor()
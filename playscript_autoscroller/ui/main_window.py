@@ -2,9 +2,11 @@
 import os
 from os import path
 
-from qtpy.QtCore import Qt, QTimer
+from qtpy.QtCore import QEvent, Qt
 from qtpy.QtWidgets import (
     QFileDialog,
+    QInputDialog,
+    QLabel,
     QMainWindow,
     QMenuBar,
     QMessageBox,
@@ -26,7 +28,11 @@ from playscript_autoscroller.file_io import (
     DEFAULT_FILE_TYPE,
     SUPPORTED_FILE_TYPES,
 )
+from playscript_autoscroller.midi_recorder import SESSION_FILE_TYPE
+from playscript_autoscroller.scroll_engine import ScrollEngine
+from playscript_autoscroller.scroll_model import ScrollModel
 from .controller import Controller
+from .diagnostics_dialog import DiagnosticsDialog
 from .main_text import MainText
 from .main_toolbar import MainToolbar
 from .menus.about_menu import AboutMenu
@@ -51,6 +57,7 @@ class MainWindow(QMainWindow):
         self.centralWidget().layout().setContentsMargins(4, 4, 4, 4)
         self._was_maximized = None
         self._content_loading = False
+        self._diagnostics_dialog = None
 
         self._application = application
         self._saved_location = self._application.register_config(
@@ -93,8 +100,13 @@ class MainWindow(QMainWindow):
 
         self.pdf_view = PdfView(application, parent=self.content_holder)
         self.pdf_view.setVisible(False)
+        self.pdf_view.currentPageChanged.connect(self.on_current_page_changed)
         self.content_holder.layout().addWidget(self.pdf_view)
 
+        self.page_indicator = QLabel(self)
+        self.page_indicator.setVisible(False)
+        self.statusBar().addPermanentWidget(self.page_indicator)
+
         self.splitter.addWidget(self.content_holder)
         self.splitter.setStretchFactor(1, 5)
         self.outline_tree.pressed.connect(self.on_outline_press)
@@ -102,14 +114,37 @@ class MainWindow(QMainWindow):
         self.centralWidget().layout().addWidget(self.splitter)
 
         # Controller
-        self.scroll_controller = Controller(self._application, parent=self)
+        self.scroll_model = ScrollModel(Controller.Default)
+        self.scroll_controller = Controller(self._application, self.scroll_model, parent=self)
         self.centralWidget().layout().addWidget(self.scroll_controller)
 
-        # Scroll Timer
-        self.text_scroll_timer = QTimer()
-        self.text_scroll_timer.setInterval(100)
-        self.text_scroll_timer.timeout.connect(self.slider_scroll_tick)
-        self.text_scroll_timer.start()
+        runner = self._application.runner
+        runner.ignoreToggled.connect(self.scroll_model.toggle_ignored)
+        runner.midpointUpdate.connect(self.scroll_model.input_midpoint)
+        runner.pauseToggled.connect(self.scroll_model.toggle_paused)
+        runner.scrollUpdate.connect(self.scroll_model.input_value)
+        runner.filtersChanged.connect(self.scroll_model.set_filters)
+        runner.nextHeading.connect(self.go_to_next_heading)
+        runner.previousHeading.connect(self.go_to_previous_heading)
+        runner.zoomIn.connect(self.zoom_in)
+        runner.zoomOut.connect(self.zoom_out)
+
+        # Scroll Engine
+        self.scroll_engine = ScrollEngine(
+            self.scroll_model.velocity, self.scroll_by, parent=self)
+        self.scroll_engine.frameStarted.connect(runner.poll)
+        self.scroll_engine.frameStarted.connect(self.scroll_model.advance)
+        self.scroll_engine.frameStarted.connect(self.scroll_controller.refresh)
+        self.scroll_engine.start()
+        self.pdf_view.set_velocity_source(self.scroll_model.velocity)
+
+        # For measuring latency through to the repainting of scrolled content
+        self._latency = runner.latency
+        self._scrolled_viewports = [self.main_text.viewport()]
+        if hasattr(self.pdf_view, 'viewport'):
+            self._scrolled_viewports.append(self.pdf_view.viewport())
+        for viewport in self._scrolled_viewports:
+            viewport.installEventFilter(self)
 
     @property
     def pdf_view_active(self):
@@ -129,6 +164,12 @@ class MainWindow(QMainWindow):
             return event.accept()
         return event.ignore()
 
+    def eventFilter(self, watched, event):
+        # pylint: disable=invalid-name
+        if event.type() == QEvent.Paint and watched in self._scrolled_viewports:
+            self._latency.reach('paint')
+        return super().eventFilter(watched, event)
+
     def enable_outline(self, enable):
         self.show_outline(enable and self.toolbar.should_show_outline())
 
@@ -144,6 +185,44 @@ class MainWindow(QMainWindow):
 
         return self.DefaultLocation
 
+    def go_to_heading(self, forwards):
+        if self.pdf_view_active:
+            current = self.pdf_view.current_page()
+            def heading_position(index):
+                fraction = self.outline_model.data(index, PAGE_FRACTION)
+                if not isinstance(fraction, float):
+                    fraction = 0
+                return self.outline_model.data(index, POSITION_ROLE) + fraction
+        else:
+            current = self.main_text.current_position()
+            def heading_position(index):
+                return self.outline_model.data(index, POSITION_ROLE)
+
+        # Allow for a jumped-to heading not quite landing at the top of the viewport.
+        epsilon = 0.01
+        headings = self.outline_model.headings()
+        if forwards:
+            candidates = [idx for idx in headings if heading_position(idx) > current + epsilon]
+            target = min(candidates, key=heading_position, default=None)
+        else:
+            candidates = [idx for idx in headings if heading_position(idx) < current - epsilon]
+            target = max(candidates, key=heading_position, default=None)
+
+        if target is None:
+            return
+        self.outline_tree.setCurrentIndex(target)
+        self.on_outline_press(target)
+
+    def go_to_next_heading(self):
+        self.go_to_heading(True)
+
+    def go_to_previous_heading(self):
+        self.go_to_heading(False)
+
+    def on_current_page_changed(self, page, page_count):
+        self.page_indicator.setText(f"Page {page} / {page_count}")
+        self.page_indicator.setVisible(page_count > 0)
+
     def on_outline_press(self, index):
         idx = self.outline_model.data(index, POSITION_ROLE)
         if self.pdf_view_active:
@@ -156,6 +235,12 @@ class MainWindow(QMainWindow):
             return
         self.rebuild_outline()
 
+    def open_diagnostics(self):
+        if not self._diagnostics_dialog:
+            self._diagnostics_dialog = DiagnosticsDialog(self._application, parent=self)
+            self._diagnostics_dialog.retranslate_ui()
+        self._diagnostics_dialog.show()
+
     def open_midi_config(self):
         self._application.runner.open_config_dialog(self)
 
@@ -204,6 +289,23 @@ class MainWindow(QMainWindow):
 
         return f"{response[0]}{file_ext}"
 
+    def prompt_session_filename(self, save):
+        location = self.get_valid_location()
+        if save:
+            response = QFileDialog.getSaveFileName(
+                self, "Record MIDI Session as...", location, SESSION_FILE_TYPE[0])
+        else:
+            response = QFileDialog.getOpenFileName(
+                self, "Select MIDI Session to replay...", location, SESSION_FILE_TYPE[0])
+
+        if not response[0]:
+            return None
+
+        if not save or response[0].endswith(SESSION_FILE_TYPE[1]):
+            return response[0]
+
+        return f"{response[0]}{SESSION_FILE_TYPE[1]}"
+
     def prompt_unsaved(self):
         if not self._application.is_dirty():
             return True
@@ -224,13 +326,33 @@ class MainWindow(QMainWindow):
 
         return self._application.file_save()
 
-    def slider_scroll_tick(self):
-        difference, interval = self.scroll_controller.value()
-        if self.pdf_view_active:
-            self.pdf_view.scroll(difference)
-        else:
-            self.main_text.scroll(difference)
-        self.text_scroll_timer.setInterval(interval)
+    def record_midi_session(self, enable):
+        if not enable:
+            self._application.runner.stop_recording()
+            return
+
+        filename = self.prompt_session_filename(save=True)
+        if not filename:
+            self.menu_file.set_midi_record_checked(False)
+            return
+
+        if not self._application.runner.start_recording(filename):
+            self.menu_file.set_midi_record_checked(False)
+
+    def replay_midi_session(self):
+        filename = self.prompt_session_filename(save=False)
+        if not filename:
+            return
+
+        speed, accepted = QInputDialog.getDouble(
+            self,
+            "Replay MIDI Session",
+            "Speed multiplier (0 = as fast as possible):",
+            1, 0, 100, 1)
+        if not accepted:
+            return
+
+        self._application.runner.start_replay(filename, speed)
 
     def rebuild_outline(self):
         self.outline_model.determine_outline(self.main_text.document())
@@ -272,6 +394,13 @@ class MainWindow(QMainWindow):
 
         self.scroll_controller.retranslate_ui()
 
+    def scroll_by(self, step):
+        if self.pdf_view_active:
+            self.pdf_view.scroll(step)
+        else:
+            self.main_text.scroll(step)
+        self._latency.reach('scroll', 'paint')
+
     def set_fullscreen(self, enable):
         if enable:
             self._was_maximized = self.windowState() & Qt.WindowMaximized
@@ -281,16 +410,20 @@ class MainWindow(QMainWindow):
         else:
             self.showNormal()
 
+    def sync_frame_rate(self, screen=None):
+        screen = screen or self.screen()
+        self.scroll_engine.set_frame_rate(screen.refreshRate())
+
     def show_outline(self, show):
         if show:
             self.outline_tree.show()
         else:
             self.outline_tree.hide()
 
-    def show_pdf(self, pdf_document):
+    def show_pdf(self, pdf_document, filename=None):
         self.reset_content()
         self.main_text.setVisible(False)
-        self.pdf_view.set_pdf(pdf_document)
+        self.pdf_view.set_pdf(pdf_document, filename)
         self.pdf_view.setVisible(True)
         self.outline_model.determine_from_pdf(pdf_document)
         self.outline_tree.expandAll()
@@ -313,19 +446,19 @@ class MainWindow(QMainWindow):
             self.STATUSBAR_MSG_DURATION
         )
 
-    def zoom_in(self, _):
+    def zoom_in(self, _=None):
         if self.pdf_view_active:
             self.pdf_view.zoom_in()
         else:
             self.main_text.zoom_in()
 
-    def zoom_out(self, _):
+    def zoom_out(self, _=None):
         if self.pdf_view_active:
             self.pdf_view.zoom_out()
         else:
             self.main_text.zoom_out()
 
-    def zoom_reset(self, _):
+    def zoom_reset(self, _=None):
         if self.pdf_view_active:
             self.pdf_view.zoom_reset()
         else:
@@ -42,6 +42,19 @@ class FileMenu(ApplicationMenu):
         self._actions['midi_config'].triggered.connect(self._window.open_midi_config)
         self.addAction(self._actions['midi_config'])
 
+        self._actions['midi_record'] = QAction(self)
+        self._actions['midi_record'].setCheckable(True)
+        self._actions['midi_record'].triggered.connect(self._window.record_midi_session)
+        self.addAction(self._actions['midi_record'])
+
+        self._actions['midi_replay'] = QAction(self)
+        self._actions['midi_replay'].triggered.connect(self._window.replay_midi_session)
+        self.addAction(self._actions['midi_replay'])
+
+        self._actions['diagnostics'] = QAction(self)
+        self._actions['diagnostics'].triggered.connect(self._window.open_diagnostics)
+        self.addAction(self._actions['diagnostics'])
+
         self.addSeparator()
 
         self._actions['fullscreen'] = QAction(self)
@@ -80,6 +93,18 @@ class FileMenu(ApplicationMenu):
         self._actions['midi_config'].setText(translate("MainWindow", "Settings"))
         self._actions['midi_config'].setStatusTip(translate("MainWindow", "Open MIDI Config"))
 
+        self._actions['midi_record'].setText(translate("MainWindow", "Record MIDI Session"))
+        self._actions['midi_record'].setStatusTip(
+                translate("MainWindow", "Record all incoming MIDI messages to a file"))
+
+        self._actions['midi_replay'].setText(translate("MainWindow", "Replay MIDI Session..."))
+        self._actions['midi_replay'].setStatusTip(
+                translate("MainWindow", "Replay a recorded MIDI Session as if it were live"))
+
+        self._actions['diagnostics'].setText(translate("MainWindow", "Diagnostics"))
+        self._actions['diagnostics'].setStatusTip(
+                translate("MainWindow", "Show input latency and MIDI device statistics"))
+
         self._actions['fullscreen'].setText(translate("MainWindow", "Full Screen"))
         self._actions['fullscreen'].setStatusTip(translate("MainWindow", "Toggle Full Screen"))
         if QKeySequence(QKeySequence.FullScreen).isEmpty():
@@ -91,6 +116,9 @@ class FileMenu(ApplicationMenu):
         self._actions['exit'].setStatusTip(translate("MainWindow", "Exit {}").format(__app_name__))
         self._actions['exit'].setShortcut(QKeySequence.Quit)
 
+    def set_midi_record_checked(self, checked):
+        self._actions['midi_record'].setChecked(checked)
+
     def set_file_save_enabled(self, enabled):
         self._actions['save'].setEnabled(enabled)
         self._actions['save_as'].setEnabled(enabled)
@@ -1,14 +1,23 @@
 
+from qtpy.QtCore import Qt
 from qtpy.QtWidgets import (
     QComboBox,
     QDialog,
     QDialogButtonBox,
     QFormLayout,
     QGroupBox,
+    QHBoxLayout,
     QLabel,
+    QListWidget,
+    QPushButton,
     QSpinBox,
+    QVBoxLayout,
 )
 
+from ..input_filters import FILTERS
+from ..midi_devices import MidiDevices, MidiDeviceScanner
+from ..rtmidi_input import RTMIDI_SUPPORT
+from .bindings_editor import BindingsEditor
 from .device_selector import DeviceSelector
 
 
@@ -21,6 +30,15 @@ class MidiConfigDialog(QDialog):
         'midpoint_control': 8,
         'ignore_note': 0,
         'pause_note': 2,
+        'hotplug_interval': 1000,
+        'hotplug_max_interval': 10000,
+        'input_backend': 'mido',
+        'scroll_source': 'cc',
+        'scroll_nrpn': 0,
+        'scroll_filter': 'none',
+        'scroll_filter_amount': 2,
+        'midpoint_filter': 'none',
+        'midpoint_filter_amount': 2,
     }
 
     def __init__(self, *args, **kwargs):
@@ -28,24 +46,74 @@ class MidiConfigDialog(QDialog):
 
         self.setLayout(QFormLayout())
 
+        # One scan of the system's MIDI ports serves both device selectors.
+        self._device_list = MidiDevices()
+        self._device_scanner = MidiDeviceScanner(self)
+        self._device_scanner.scanned.connect(self.on_devices_scanned)
+
         self._device_label = QLabel(self)
-        self._device_selector = DeviceSelector(self)
-        self._device_selector.refresh()
-        if self._device_selector.count():
-            self._device_selector.setCurrentIndex(1)
+        self._device_selector = DeviceSelector(self._device_list, self)
         self.layout().addRow(self._device_label, self._device_selector)
 
+        # Further devices, whose messages are merged with those of the above
+        self._additional_devices_label = QLabel(self)
+        self._additional_devices_list = QListWidget(self)
+        self._additional_devices_list.setMaximumHeight(80)
+        self.layout().addRow(self._additional_devices_label, self._additional_devices_list)
+
+        self._additional_device_row = QHBoxLayout()
+        self._additional_device_selector = DeviceSelector(self._device_list, self)
+        self._additional_device_row.addWidget(self._additional_device_selector, 1)
+        self._additional_device_add = QPushButton(self)
+        self._additional_device_add.clicked.connect(self.add_additional_device)
+        self._additional_device_row.addWidget(self._additional_device_add)
+        self._additional_device_remove = QPushButton(self)
+        self._additional_device_remove.clicked.connect(self.remove_additional_device)
+        self._additional_device_row.addWidget(self._additional_device_remove)
+        self.layout().addRow(self._additional_device_row)
+
         self._channel_label = QLabel(self)
         self._channel_selector = QSpinBox(self)
         self._channel_selector.setRange(1, 16)
         self._channel_selector.setValue(self.Defaults['channel'])
         self.layout().addRow(self._channel_label, self._channel_selector)
 
+        self._hotplug_interval_label = QLabel(self)
+        self._hotplug_interval_selector = QSpinBox(self)
+        self._hotplug_interval_selector.setRange(100, 60000)
+        self._hotplug_interval_selector.setSingleStep(100)
+        self._hotplug_interval_selector.setSuffix(' ms')
+        self._hotplug_interval_selector.setValue(self.Defaults['hotplug_interval'])
+        self.layout().addRow(self._hotplug_interval_label, self._hotplug_interval_selector)
+
+        self._hotplug_max_interval_label = QLabel(self)
+        self._hotplug_max_interval_selector = QSpinBox(self)
+        self._hotplug_max_interval_selector.setRange(100, 600000)
+        self._hotplug_max_interval_selector.setSingleStep(1000)
+        self._hotplug_max_interval_selector.setSuffix(' ms')
+        self._hotplug_max_interval_selector.setValue(self.Defaults['hotplug_max_interval'])
+        self.layout().addRow(
+            self._hotplug_max_interval_label, self._hotplug_max_interval_selector)
+
+        self._backend_label = QLabel(self)
+        self._backend_selector = QComboBox(self)
+        self._backend_selector.addItem('mido', 'mido')
+        if RTMIDI_SUPPORT:
+            self._backend_selector.addItem('rtmidi', 'rtmidi')
+        self.layout().addRow(self._backend_label, self._backend_selector)
+
         # Scroller control
         self._scroller_group = QGroupBox(self)
         self._scroller_group.setLayout(QFormLayout())
         self.layout().addRow(self._scroller_group)
 
+        self._source_label = QLabel(self)
+        self._source_selector = QComboBox(self)
+        for source in ('cc', 'cc14', 'nrpn', 'pitchwheel'):
+            self._source_selector.addItem(source, source)
+        self._source_selector.currentIndexChanged.connect(self.on_source_change)
+        self._scroller_group.layout().addRow(self._source_label, self._source_selector)
+
         self._control_label = QLabel(self)
         self._control_selector = QSpinBox(self)
         # CC 120 - 127 are Channel Mode Messages; and shouldn't be used arbitrarily.
@@ -53,12 +121,42 @@ class MidiConfigDialog(QDialog):
         self._control_selector.setValue(self.Defaults['scroll_control'])
         self._scroller_group.layout().addRow(self._control_label, self._control_selector)
 
+        self._nrpn_label = QLabel(self)
+        self._nrpn_selector = QSpinBox(self)
+        self._nrpn_selector.setRange(0, 16383)
+        self._nrpn_selector.setValue(self.Defaults['scroll_nrpn'])
+        self._scroller_group.layout().addRow(self._nrpn_label, self._nrpn_selector)
+
+        self._control_filter_label = QLabel(self)
+        self._control_filter_selector = self._create_filter_selector()
+        self._scroller_group.layout().addRow(
+            self._control_filter_label, self._control_filter_selector)
+
+        self._control_filter_amount_label = QLabel(self)
+        self._control_filter_amount_selector = QSpinBox(self)
+        self._control_filter_amount_selector.setRange(1, 10)
+        self._control_filter_amount_selector.setValue(self.Defaults['scroll_filter_amount'])
+        self._scroller_group.layout().addRow(
+            self._control_filter_amount_label, self._control_filter_amount_selector)
+
         self._midpoint_label = QLabel(self)
         self._midpoint_selector = QSpinBox(self)
         self._midpoint_selector.setRange(0, 119)
         self._midpoint_selector.setValue(self.Defaults['midpoint_control'])
         self._scroller_group.layout().addRow(self._midpoint_label, self._midpoint_selector)
 
+        self._midpoint_filter_label = QLabel(self)
+        self._midpoint_filter_selector = self._create_filter_selector()
+        self._scroller_group.layout().addRow(
+            self._midpoint_filter_label, self._midpoint_filter_selector)
+
+        self._midpoint_filter_amount_label = QLabel(self)
+        self._midpoint_filter_amount_selector = QSpinBox(self)
+        self._midpoint_filter_amount_selector.setRange(1, 10)
+        self._midpoint_filter_amount_selector.setValue(self.Defaults['midpoint_filter_amount'])
+        self._scroller_group.layout().addRow(
+            self._midpoint_filter_amount_label, self._midpoint_filter_amount_selector)
+
         # "Ignore" button
         self._ignore_group = QGroupBox(self)
         self._ignore_group.setLayout(QFormLayout())
@@ -93,6 +191,14 @@ class MidiConfigDialog(QDialog):
         self._pause_value_selector.setValue(self.Defaults['pause_note'])
         self._pause_group.layout().addRow(self._pause_value_label, self._pause_value_selector)
 
+        # Additional bindings
+        self._bindings_group = QGroupBox(self)
+        self._bindings_group.setLayout(QVBoxLayout())
+        self.layout().addRow(self._bindings_group)
+
+        self._bindings_editor = BindingsEditor(self)
+        self._bindings_group.layout().addWidget(self._bindings_editor)
+
         # Save / Cancel Buttons
         self._button_box = QDialogButtonBox(self)
         self._button_box.addButton(QDialogButtonBox.Save)
@@ -101,13 +207,31 @@ class MidiConfigDialog(QDialog):
         self._button_box.rejected.connect(self.reject)
         self.layout().addRow(self._button_box)
 
+        self.on_source_change()
         self.retranslate_ui()
 
+    def _create_filter_selector(self):
+        selector = QComboBox(self)
+        for filter_name in FILTERS:
+            selector.addItem(filter_name, filter_name)
+        return selector
+
+    def add_additional_device(self):
+        device = self._additional_device_selector.value()
+        if device and not self._additional_devices_list.findItems(device, Qt.MatchExactly):
+            self._additional_devices_list.addItem(device)
+
     def conform_sizes(self):
         # Conform all nested controls to the same spacing
         labels = [
+            self._source_label,
             self._control_label,
+            self._nrpn_label,
+            self._control_filter_label,
+            self._control_filter_amount_label,
             self._midpoint_label,
+            self._midpoint_filter_label,
+            self._midpoint_filter_amount_label,
             self._ignore_type_label,
             self._ignore_value_label,
             self._pause_type_label,
@@ -121,20 +245,87 @@ class MidiConfigDialog(QDialog):
 
     def deserialise(self, config):
         self._device_selector.setValue(config['device'])
+        self._additional_devices_list.clear()
+        self._additional_devices_list.addItems(config.get('additional_devices', []))
         self._channel_selector.setValue(config['channel'] + 1)
+        self._hotplug_interval_selector.setValue(config['hotplug_interval'])
+        self._hotplug_max_interval_selector.setValue(config['hotplug_max_interval'])
+        self._backend_selector.setCurrentIndex(
+            max(self._backend_selector.findData(config['input_backend']), 0))
+        self._source_selector.setCurrentIndex(
+            self._source_selector.findData(config['scroll_source']))
         self._control_selector.setValue(config['scroll_control'])
+        self._nrpn_selector.setValue(config['scroll_nrpn'])
         self._midpoint_selector.setValue(config['midpoint_control'])
         self._ignore_value_selector.setValue(config['ignore_note'])
         self._pause_value_selector.setValue(config['pause_note'])
+        self._control_filter_selector.setCurrentIndex(
+            self._control_filter_selector.findData(config['scroll_filter']))
+        self._control_filter_amount_selector.setValue(config['scroll_filter_amount'])
+        self._midpoint_filter_selector.setCurrentIndex(
+            self._midpoint_filter_selector.findData(config['midpoint_filter']))
+        self._midpoint_filter_amount_selector.setValue(config['midpoint_filter_amount'])
+        self._bindings_editor.deserialise(config.get('bindings', []))
+
+    def on_devices_scanned(self, mido_names):
+        added, removed = self._device_list.update(mido_names)
+        self._device_selector.update_ports(added, removed)
+        self._additional_device_selector.update_ports(added, removed)
+
+    def on_source_change(self):
+        source = self._source_selector.currentData()
+        # The LSB of a 14-bit Control Change is sent 32 controls above its MSB.
+        self._control_selector.setRange(0, 31 if source == 'cc14' else 119)
+        self._control_selector.setEnabled(source in ('cc', 'cc14'))
+        self._nrpn_selector.setEnabled(source == 'nrpn')
+
+    def remove_additional_device(self):
+        for item in self._additional_devices_list.selectedItems():
+            self._additional_devices_list.takeItem(self._additional_devices_list.row(item))
+
+    def showEvent(self, event):
+        # pylint: disable=invalid-name
+        self._device_scanner.scan()
+        super().showEvent(event)
 
     def retranslate_ui(self):
         self._device_label.setText('MIDI Device')
         self._device_selector.setPlaceholderText('Select...')
+        self._additional_devices_label.setText('Additional MIDI Devices')
+        self._additional_device_selector.setPlaceholderText('Select...')
+        self._additional_device_add.setText('Add')
+        self._additional_device_remove.setText('Remove')
         self._channel_label.setText('MIDI Channel')
+        self._hotplug_interval_label.setText('Reconnection Check Interval')
+        self._hotplug_max_interval_label.setText('Reconnection Check Maximum Interval')
+        self._backend_label.setText('MIDI Input Method')
+        self._backend_selector.setItemText(0, 'Standard (mido)')
+        if self._backend_selector.count() > 1:
+            self._backend_selector.setItemText(1, 'Fast (python-rtmidi)')
 
         self._scroller_group.setTitle('Scrolling')
+        self._source_label.setText('Scrolling Source')
+        self._source_selector.setItemText(0, 'Control Change')
+        self._source_selector.setItemText(1, 'Control Change (14-bit)')
+        self._source_selector.setItemText(2, 'NRPN')
+        self._source_selector.setItemText(3, 'Pitch Bend')
         self._control_label.setText('Scrolling Control #')
+        self._nrpn_label.setText('Scrolling NRPN #')
+        self._control_filter_label.setText('Scrolling Smoothing')
+        self._control_filter_amount_label.setText('Scrolling Smoothing Amount')
         self._midpoint_label.setText('Midpoint Control #')
+        self._midpoint_filter_label.setText('Midpoint Smoothing')
+        self._midpoint_filter_amount_label.setText('Midpoint Smoothing Amount')
+
+        filter_names = {
+            'none': 'None',
+            'ema': 'Moving Average',
+            'one_euro': 'One Euro',
+            'hysteresis': 'Hysteresis',
+        }
+        for selector in (self._control_filter_selector, self._midpoint_filter_selector):
+            for idx in range(selector.count()):
+                selector.setItemText(idx, filter_names[selector.itemData(idx)])
 
         self._pause_group.setTitle('Pause Button')
         self._pause_type_label.setText('Message Type')
@@ -146,14 +337,37 @@ class MidiConfigDialog(QDialog):
         self._ignore_type_selector.setItemText(0, 'Note On')
         self._ignore_value_label.setText('Note #')
 
+        self._bindings_group.setTitle('Additional Bindings')
+        self._bindings_editor.retranslate_ui()
+
         self.conform_sizes()
 
     def serialise(self):
-        return {
+        config = {
             'device': self._device_selector.value() or '',
             'channel': self._channel_selector.value() - 1,
+            'hotplug_interval': self._hotplug_interval_selector.value(),
+            'hotplug_max_interval': self._hotplug_max_interval_selector.value(),
+            'input_backend': self._backend_selector.currentData(),
+            'scroll_source': self._source_selector.currentData(),
             'scroll_control': self._control_selector.value(),
+            'scroll_nrpn': self._nrpn_selector.value(),
             'midpoint_control': self._midpoint_selector.value(),
             'ignore_note': self._ignore_value_selector.value(),
             'pause_note': self._pause_value_selector.value(),
+            'scroll_filter': self._control_filter_selector.currentData(),
+            'scroll_filter_amount': self._control_filter_amount_selector.value(),
+            'midpoint_filter': self._midpoint_filter_selector.currentData(),
+            'midpoint_filter_amount': self._midpoint_filter_amount_selector.value(),
         }
+        additional_devices = [
+            self._additional_devices_list.item(row).text()
+            for row in range(self._additional_devices_list.count())
+        ]
+        if additional_devices:
+            config['additional_devices'] = additional_devices
+        bindings = self._bindings_editor.serialise()
+        if bindings:
+            # strictyaml is unable to write out an empty list
+            config['bindings'] = bindings
+        return config
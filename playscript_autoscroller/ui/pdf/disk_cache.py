@@ -0,0 +1,186 @@
+import hashlib
+import os
+from tempfile import mkstemp
+from threading import Lock
+from time import monotonic
+
+from qtpy.QtGui import QImage
+
+
+def file_hash(filename):
+    """A digest of a file's content, so that renders of it may be recognised across runs."""
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as filehandle:
+        for chunk in iter(lambda: filehandle.read(1048576), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class FileDigest:
+    """
+    The `file_hash` of a file, worked out when first asked for and remembered from then on.
+
+    Asked for by the disk cache, so the file is read from a render worker thread rather
+    than holding up the GUI thread. None if the file can't be read.
+    """
+
+    def __init__(self, filename):
+        self._filename = filename
+        self._digest = None
+        self._done = False
+        self._lock = Lock()
+
+    @property
+    def value(self):
+        with self._lock:
+            if not self._done:
+                try:
+                    self._digest = file_hash(self._filename)
+                except OSError:
+                    pass
+                self._done = True
+            return self._digest
+
+
+class DiskPageCache:
+    """
+    Rendered pages (or tiles of them), saved as PNG files in a directory, limited by their
+    total size.
+
+    Keys identify a render completely: `(file digest, page, tile, dpi, render hints)`, the
+    digest being a `FileDigest`. Renders of a file that can't be read aren't cached.
+
+    The directory may be shared by several instances of the program at once: files are
+    written under a temporary name then renamed into place, so are never seen half-written,
+    and a file vanishing (pruned by another instance) is merely a miss. When over budget,
+    the least recently used files are pruned, as judged by their modification times (which
+    are refreshed whenever a file is read). As other instances' writes count towards the
+    budget too, the directory is re-scanned every `RescanInterval`, as well as whenever
+    this instance's own writes would take it over.
+
+    Used from the render worker threads.
+    """
+
+    Extension = '.png'
+    PruneTo = 0.9 # of the budget, so as not to prune again with the next write
+    RescanInterval = 5 # s
+
+    def __init__(self, directory, budget):
+        self._directory = directory
+        self._budget = budget
+        # Not known until the directory is first scanned.
+        self._size = None
+        self._scanned = None
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.pruned = 0
+
+    @property
+    def stats(self):
+        with self._lock:
+            return {
+                'size': self._size or 0,
+                'budget': self._budget,
+                'hits': self.hits,
+                'misses': self.misses,
+                'writes': self.writes,
+                'pruned': self.pruned,
+            }
+
+    def _filename(self, key):
+        digest = key[0].value
+        if digest is None:
+            return None
+        name = hashlib.blake2b(repr((digest,) + key[1:]).encode(), digest_size=16).hexdigest()
+        return os.path.join(self._directory, name + self.Extension)
+
+    def _prune(self):
+        """Works out the size of the cache, removing the oldest files if over budget."""
+        entries = []
+        try:
+            with os.scandir(self._directory) as scan:
+                for entry in scan:
+                    if not entry.name.endswith(self.Extension):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except FileNotFoundError:
+            pass
+
+        size = sum(entry[1] for entry in entries)
+        if size > self._budget:
+            entries.sort()
+            for _, file_size, filename in entries:
+                if size <= self._budget * self.PruneTo:
+                    break
+                try:
+                    os.remove(filename)
+                    self.pruned += 1
+                except OSError:
+                    pass
+                size -= file_size
+        self._size = size
+        self._scanned = monotonic()
+
+    def get(self, key):
+        filename = self._filename(key)
+        if not filename:
+            return None
+        image = QImage(filename)
+        if image.isNull():
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            os.utime(filename)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return image
+
+    def put(self, key, image):
+        # Not being able to cache a render is no reason not to show it.
+        filename = self._filename(key)
+        if not filename:
+            return
+        temp_filename = None
+        try:
+            os.makedirs(self._directory, exist_ok=True)
+            handle, temp_filename = mkstemp(suffix='.tmp', dir=self._directory)
+            os.close(handle)
+            if not image.save(temp_filename, 'PNG'):
+                os.remove(temp_filename)
+                return
+            file_size = os.path.getsize(temp_filename)
+            os.replace(temp_filename, filename)
+        except OSError:
+            if temp_filename and os.path.exists(temp_filename):
+                os.remove(temp_filename)
+            return
+
+        with self._lock:
+            self.writes += 1
+            if (self._size is None or self._size + file_size > self._budget
+                    or monotonic() - self._scanned > self.RescanInterval):
+                self._prune()
+            else:
+                self._size += file_size
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.writes = 0
+            self.pruned = 0
+
+    def set_budget(self, budget):
+        with self._lock:
+            self._budget = budget
+            if self._size is not None and self._size > budget:
+                self._prune()
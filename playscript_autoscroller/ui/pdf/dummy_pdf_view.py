@@ -1,12 +1,19 @@
 
+from qtpy.QtCore import Signal as QSignal
 from qtpy.QtWidgets import QWidget
 
 
 class DummyPdfView(QWidget):
 
+    CurrentPageChanged = QSignal(int, int, name='currentPageChanged')
+
     def __init__(self, application, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._application = application
 
     def clear(self):
         pass
+
+    def set_velocity_source(self, velocity_source):
+        # pylint: disable=unused-argument
+        pass
@@ -0,0 +1,52 @@
+"""
+Grayscale renders of PDF pages.
+
+Most playscripts are black text on white, which needs only 8 bits a pixel, not 32: a
+quarter of the memory. Renders are converted once they're known to have no colour in them,
+mapping black and white to the gray levels of a "tone" of ink and paper; taking those from
+the palette shows pages light on dark under a dark palette.
+"""
+
+from functools import lru_cache
+
+from qtpy.QtCore import Qt
+from qtpy.QtGui import QImage, QPalette, QPixmap, qGray
+
+
+# As rendered: black ink, white paper.
+PLAIN_TONE = (0, 255)
+
+
+def palette_tone(palette):
+    """The gray levels of a palette's text and base colours, as ink and paper."""
+    return (
+        qGray(palette.color(QPalette.Text).rgb()),
+        qGray(palette.color(QPalette.Base).rgb()),
+    )
+
+
+@lru_cache(maxsize=8)
+def _tone_table(tone):
+    ink, paper = tone
+    return bytes(round(ink + (paper - ink) * level / 255) for level in range(256))
+
+
+def to_grayscale(image, tone=PLAIN_TONE):
+    """An 8-bit grayscale copy of an image, in the given tone; or None if it has colour in it."""
+    if image.isNull() or not image.allGray():
+        return None
+    gray = image.convertToFormat(QImage.Format_Grayscale8)
+    if tone != PLAIN_TONE:
+        bits = gray.bits()
+        bits.setsize(gray.sizeInBytes())
+        memory = memoryview(bits)
+        memory[:] = bytes(memory).translate(_tone_table(tone))
+    return gray
+
+
+def to_pixmap(image):
+    # Left at 8 bits a pixel, rather than converted to the display's format, where the
+    # platform allows.
+    if image.format() == QImage.Format_Grayscale8:
+        return QPixmap.fromImage(image, Qt.NoFormatConversion)
+    return QPixmap.fromImage(image)
@@ -0,0 +1,76 @@
+from collections import OrderedDict
+
+
+class PageCache:
+    """
+    Least-recently-used cache of rendered pages, limited by the total size of their pixmaps.
+
+    Keys identify a render completely: `(document, page, dpi, render hints)`.
+    """
+
+    def __init__(self, budget):
+        self._budget = budget
+        self._entries = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def stats(self):
+        return {
+            'entries': len(self._entries),
+            'size': self._size,
+            'budget': self._budget,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+    @staticmethod
+    def _pixmap_size(pixmap):
+        return pixmap.width() * pixmap.height() * pixmap.depth() // 8
+
+    def _evict_to(self, budget):
+        while self._entries and self._size > budget:
+            _, pixmap = self._entries.popitem(last=False)
+            self._size -= self._pixmap_size(pixmap)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self._size = 0
+
+    def get(self, key):
+        pixmap = self._entries.get(key)
+        if pixmap is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return pixmap
+
+    def put(self, key, pixmap):
+        size = self._pixmap_size(pixmap)
+        if size > self._budget:
+            return
+
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size -= self._pixmap_size(previous)
+
+        self._evict_to(self._budget - size)
+        self._entries[key] = pixmap
+        self._size += size
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def set_budget(self, budget):
+        self._budget = budget
+        self._evict_to(budget)
@@ -0,0 +1,67 @@
+from bisect import bisect_right
+
+
+class PageGeometry:
+    """
+    Where each page of a document starts, in a column of pages laid out one under another.
+
+    Kept as a running total of the pages' heights (and the spacing between them), so that
+    the position of a page is found by lookup, and the page at a position by binary search.
+    To be rebuilt whenever the pages are resized.
+    """
+
+    def __init__(self, heights=(), top_margin=0, spacing=0):
+        self._heights = list(heights)
+        self._tops = []
+        position = top_margin
+        for height in self._heights:
+            self._tops.append(position)
+            position += height + spacing
+
+    def __len__(self):
+        return len(self._heights)
+
+    @property
+    def bottom(self):
+        """The position of the bottom of the last page."""
+        if not self._heights:
+            return 0
+        return self._tops[-1] + self._heights[-1]
+
+    @property
+    def tops(self):
+        return self._tops
+
+    def height(self, page_index):
+        return self._heights[page_index]
+
+    def offset(self, page_index, page_fraction=0):
+        """The position of the given fraction of the way down a (0-based) page."""
+        if not self._heights:
+            return 0
+        page_index = max(0, min(page_index, len(self._heights) - 1))
+        return self._tops[page_index] + self._heights[page_index] * page_fraction
+
+    def page_at(self, position):
+        """
+        The (0-based) page at a position, and how far down it the position is.
+
+        A position in the spacing between pages counts as the bottom of the page above.
+        """
+        if not self._heights:
+            return 0, 0
+        page_index = max(0, bisect_right(self._tops, position) - 1)
+        height = self._heights[page_index]
+        fraction = (position - self._tops[page_index]) / height if height else 0
+        return page_index, max(0, min(fraction, 1))
+
+    def pages_between(self, top, bottom):
+        """The first and last (0-based) pages (at least partly) between two positions."""
+        if not self._heights:
+            return 0, 0
+        first, _ = self.page_at(top)
+        last, _ = self.page_at(bottom)
+        # A page whose bottom is only reached by spacing isn't between.
+        if self._tops[first] + self._heights[first] < top and first < last:
+            first += 1
+        return first, last
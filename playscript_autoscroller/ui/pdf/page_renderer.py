@@ -0,0 +1,205 @@
+from time import perf_counter
+
+from qtpy.QtCore import (
+    QCoreApplication,
+    QObject,
+    QRunnable,
+    QThread,
+    QThreadPool,
+    Signal as QSignal,
+)
+from qtpy.QtGui import QImage
+
+from .grayscale import to_grayscale
+from .render_server import RemotePage
+
+
+class RenderJob(QRunnable):
+
+    def __init__(self, renderer, key, page, dpi, rect, disk_cache, disk_key, tone):
+        super().__init__()
+        # Kept by the renderer until finished, so it may be taken back off the queue.
+        self.setAutoDelete(False)
+        self._renderer = renderer
+        self._key = key
+        self._page = page
+        self._dpi = dpi
+        self._rect = rect
+        self._disk_cache = disk_cache
+        self._disk_key = disk_key
+        self._tone = tone
+        self._cancelled = False
+        self.done = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        try:
+            self._render()
+        finally:
+            self.done = True
+
+    def _render(self):
+        if self._cancelled:
+            return
+        start = perf_counter()
+        image = self._disk_cache.get(self._disk_key) if self._disk_cache else None
+        if image is not None:
+            if not self._cancelled:
+                self._renderer.Finished.emit(
+                    self, self._key, image, perf_counter() - start, None)
+            return
+
+        # Images rendered out of process are shared with the GUI thread, so are released by
+        # both it and this thread when done with.
+        shared = None
+        if isinstance(self._page, RemotePage):
+            shared = self._page.render(self._dpi, self._rect)
+            image = shared.image if shared else QImage()
+        elif self._rect:
+            image = self._page.renderToImage(
+                self._dpi, self._dpi,
+                self._rect.x(), self._rect.y(), self._rect.width(), self._rect.height())
+        else:
+            image = self._page.renderToImage(self._dpi, self._dpi)
+        if self._tone:
+            image = to_grayscale(image, self._tone) or image
+
+        # Converted to grayscale, the image is a copy, no longer needing the shared memory.
+        handed_over = shared if shared and image is shared.image else None
+        emitted = not self._cancelled
+        if emitted:
+            self._renderer.Finished.emit(
+                self, self._key, image, perf_counter() - start, handed_over)
+        if self._disk_cache and not image.isNull():
+            self._disk_cache.put(self._disk_key, image)
+        if shared:
+            shared.release()
+            if not (emitted and handed_over):
+                shared.release()
+
+
+class PageRenderer(QObject):
+    """
+    Rasterises PDF pages, or parts of them, in a pool of worker threads.
+
+    Renders are queued under a (hashable) key, with a priority (the higher, the sooner
+    rendered), and are handed back through `pageRendered`, with their key, as `QImage`s, to
+    be turned into pixmaps in the GUI thread. Those still in a `RenderServer`'s shared memory
+    come with their `SharedImage`, to be kept (see `SharedImage.keep_for`) by whatever goes
+    on using the memory; otherwise None.
+
+    Cancelling everything (as when the zoom changes) also invalidates any renders already
+    underway, so that their results are discarded when they arrive.
+
+    If given a `DiskPageCache`, renders are looked for there first (in the worker thread),
+    and saved there afterwards.
+
+    Given a tone (see `grayscale`), renders without colour in them are converted to
+    grayscale, in that tone; those with colour are handed back as they are.
+
+    Pages may also be `RemotePage`s, rendered by a `RenderServer`. Renders that fail (as
+    when the server's worker crashes) aren't requested again until `forget_failures`.
+    """
+
+    Finished = QSignal(object, object, QImage, float, object, name='finished')
+    PageRendered = QSignal(object, QImage, object, name='pageRendered')
+
+    MaxThreads = 4
+
+    def __init__(self, parent=None, max_threads=MaxThreads):
+        super().__init__(parent)
+        self._pool = QThreadPool(self)
+        # Leave a core for the GUI thread.
+        self._pool.setMaxThreadCount(max(1, min(QThread.idealThreadCount() - 1, max_threads)))
+        self._jobs = {}
+        # Jobs cancelled too late to be taken back off the queue: kept until they've run, so
+        # as not to be deleted from under the worker thread running them.
+        self._abandoned_jobs = set()
+        self._failed = set()
+        self.disk_cache = None
+        self.finished.connect(self.on_finished)
+        # Don't leave workers rendering whilst the program is torn down around them.
+        QCoreApplication.instance().aboutToQuit.connect(self.shutdown)
+
+        self._requested = 0
+        self._rendered = 0
+        self._cancelled = 0
+        self._render_time = 0.0
+        self._max_render_time = 0.0
+
+    @property
+    def pending(self):
+        return self._jobs.keys()
+
+    @property
+    def stats(self):
+        """Render times are in seconds."""
+        return {
+            'queued': len(self._jobs),
+            'requested': self._requested,
+            'rendered': self._rendered,
+            'cancelled': self._cancelled,
+            'failed': len(self._failed),
+            'mean_time': self._render_time / self._rendered if self._rendered else 0.0,
+            'max_time': self._max_render_time,
+        }
+
+    def cancel(self, key):
+        job = self._jobs.pop(key, None)
+        if job:
+            job.cancel()
+            if not self._pool.tryTake(job):
+                self._abandoned_jobs.add(job)
+            self._cancelled += 1
+        self._abandoned_jobs = {job for job in self._abandoned_jobs if not job.done}
+
+    def cancel_all(self):
+        for key in list(self._jobs):
+            self.cancel(key)
+
+    def forget_failures(self):
+        self._failed = set()
+
+    def on_finished(self, job, key, image, render_time, shared):
+        self._rendered += 1
+        self._render_time += render_time
+        self._max_render_time = max(self._max_render_time, render_time)
+
+        # Not some other job since queued under the same key.
+        if self._jobs.get(key) is job:
+            del self._jobs[key]
+            if image.isNull():
+                self._failed.add(key)
+            else:
+                self.PageRendered.emit(key, image, shared)
+        if shared:
+            shared.release()
+
+    def request(self, key, page, dpi, priority=0, rect=None, disk_key=None, tone=None):
+        """
+        `rect`, if given, is the part of the page to render, in pixels at `dpi`.
+
+        `disk_key`, if given, is the key to look the render up in the disk cache by.
+
+        `tone`, if given, is that to convert the render to grayscale in.
+        """
+        if key in self._jobs or key in self._failed:
+            return
+        disk_cache = self.disk_cache if disk_key else None
+        job = RenderJob(self, key, page, dpi, rect, disk_cache, disk_key, tone)
+        self._jobs[key] = job
+        self._requested += 1
+        self._pool.start(job, priority)
+
+    def reset_stats(self):
+        self._requested = 0
+        self._rendered = 0
+        self._cancelled = 0
+        self._render_time = 0.0
+        self._max_render_time = 0.0
+
+    def shutdown(self):
+        self.cancel_all()
+        self._pool.waitForDone()
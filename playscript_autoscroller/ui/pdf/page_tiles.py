@@ -0,0 +1,110 @@
+from qtpy.QtCore import QRect, QRectF, Qt
+from qtpy.QtGui import QPainter
+
+
+class PageTiles:
+    """
+    What there is to show of a page of a PDF: square tiles rendered at the page's current
+    resolution.
+
+    Until the tiles are all there, whatever else is to hand is shown beneath them, scaled to
+    fit: a (low resolution) preview of the whole page, and any tiles rendered before the
+    resolution last changed. Those old tiles are let go of once covered by new ones.
+    """
+
+    TileSize = 512 # px
+
+    def __init__(self, size):
+        self._size = size
+        self._dpi = 0
+        self._tiles = {}
+        self._stale_tiles = {}
+        self._stale_scale = 1
+        self._preview = None
+
+    @property
+    def rect(self):
+        return QRect(0, 0, self._size.width(), self._size.height())
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def tiles(self):
+        return self._tiles.keys()
+
+    def _stale_rect(self, tile):
+        pixmap = self._stale_tiles[tile]
+        return QRectF(
+            tile[0] * self.TileSize * self._stale_scale,
+            tile[1] * self.TileSize * self._stale_scale,
+            pixmap.width() * self._stale_scale,
+            pixmap.height() * self._stale_scale)
+
+    def clear(self):
+        self._tiles = {}
+        self._stale_tiles = {}
+        self._preview = None
+
+    def has_content(self):
+        return bool(self._tiles or self._stale_tiles or self._preview)
+
+    def paint(self, painter, clip, paper=Qt.white):
+        """
+        Paints the page at the painter's origin; `clip` is the part needed, in page pixels.
+        Where there's nothing to show yet, the page is the colour of `paper`.
+        """
+        painter.fillRect(clip, paper)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        if self._preview:
+            painter.drawPixmap(QRectF(self.rect), self._preview, QRectF(self._preview.rect()))
+        for tile, pixmap in self._stale_tiles.items():
+            painter.drawPixmap(self._stale_rect(tile), pixmap, QRectF(pixmap.rect()))
+        for tile, pixmap in self._tiles.items():
+            rect = self.tile_rect(tile)
+            if clip.intersects(rect):
+                painter.drawPixmap(rect.topLeft(), pixmap)
+
+    def remove_tile(self, tile):
+        return self._tiles.pop(tile, None) is not None
+
+    def resize(self, size, dpi):
+        if dpi == self._dpi:
+            return
+        self._size = size
+        if self._tiles:
+            self._stale_tiles = self._tiles
+            self._stale_scale = dpi / self._dpi
+        elif self._stale_tiles:
+            self._stale_scale *= dpi / self._dpi
+        self._tiles = {}
+        self._dpi = dpi
+
+    def set_preview(self, pixmap):
+        self._preview = pixmap
+
+    def set_tile(self, tile, pixmap):
+        self._tiles[tile] = pixmap
+        for stale_tile in list(self._stale_tiles):
+            covering = self.tiles_in(self._stale_rect(stale_tile).toAlignedRect())
+            if all(covering_tile in self._tiles for covering_tile in covering):
+                del self._stale_tiles[stale_tile]
+
+    def tile_rect(self, tile):
+        """The part of the page a tile covers, in pixels at the current resolution."""
+        column, row = tile
+        rect = QRect(column * self.TileSize, row * self.TileSize, self.TileSize, self.TileSize)
+        return rect.intersected(self.rect)
+
+    def tiles_in(self, rect):
+        """The tiles (as `(column, row)`) overlapping the given part of the page."""
+        rect = rect.intersected(self.rect)
+        if rect.isEmpty():
+            return []
+        return [
+            (column, row)
+            for row in range(rect.top() // self.TileSize, rect.bottom() // self.TileSize + 1)
+            for column in range(
+                rect.left() // self.TileSize, rect.right() // self.TileSize + 1)
+        ]
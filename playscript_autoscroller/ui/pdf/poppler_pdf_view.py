@@ -1,109 +1,590 @@
 
-from qtpy.QtCore import Qt
-from qtpy.QtGui import QPixmap
-from qtpy.QtWidgets import (
-    QLabel,
-    QScrollArea,
-    QSizePolicy,
-    QVBoxLayout,
-    QWidget,
-)
+from os import path
+
+from qtpy.QtCore import QCoreApplication, QRect, QSize, Qt, QTimer, Signal as QSignal
+from qtpy.QtGui import QColor, QImage, QPainter, QPalette
+from qtpy.QtWidgets import QAbstractScrollArea
 
 from popplerqt5 import Poppler
 
-class PopplerPdfView(QScrollArea):
+from playscript_autoscroller import __cache_dir__
+from .disk_cache import DiskPageCache, FileDigest
+from .grayscale import PLAIN_TONE, palette_tone, to_pixmap
+from .page_cache import PageCache
+from .page_geometry import PageGeometry
+from .page_renderer import PageRenderer
+from .page_tiles import PageTiles
+from .render_server import RenderServer
+
+class PopplerPdfView(QAbstractScrollArea):
+    """
+    Shows all pages of a PDF, one under another.
+
+    There are no widgets per page: pages are placed by their dimensions alone (see
+    `PageGeometry`), and the viewport paints whichever of them are in view. So neither
+    laying out nor scrolling costs more the more pages there are.
+
+    Pages are shown as blank placeholders until rendered, which they are once they come
+    within `pdf_prefetch` pages of the viewport. Rendered pages that
+    move more than twice that distance away are discarded again, so neither the time taken
+    to show a document nor the memory used depends on how many pages it has.
+
+    Rendering happens in worker threads (see `PageRenderer`), pages nearest the viewport
+    first, so that scrolling carries on whilst pages are rasterised. Rendered pages are kept
+    in a cache of `pdf_cache_size` MiB, so returning to a page (or a zoom level) seen
+    recently doesn't need it rendering again. They're also saved to a cache on disk, of
+    `pdf_disk_cache_size` MiB, so reopening a file doesn't need it rendering again either.
+
+    Whilst being auto-scrolled (see `set_velocity_source`), prefetching follows the direction
+    of travel instead: what will scroll into view within the next `PrefetchTime` seconds is
+    rendered, however many pages that is, and little is kept behind. So pages are ready in
+    time at high speed, without rendering pages that won't be reached soon at low speed.
+
+    Pages are rendered in tiles (see `PageTiles`): of the pages in view, only the tiles
+    within a tile's width of the viewport; of those either side, only the screenful nearest
+    to it. So, at high zoom, the memory used depends on the size of the viewport rather than
+    the size of the pages.
+
+    Zooming resizes the pages straight away, showing what was already rendered scaled to
+    the new size, then replaces that with sharp tiles at the new resolution.
+
+    With `pdf_render_server` set, pages are rendered in separate processes instead (see
+    `RenderServer`), so that rendering doesn't compete with the GUI, nor can a malformed
+    PDF crash it.
+
+    With `pdf_grayscale` set, pages are kept in 8-bit grayscale rather than 32-bit colour
+    (see `grayscale`), in the tone of the palette (so light on dark, under a dark palette)
+    unless `pdf_grayscale_palette` is unset. A page found to have colour in it is rendered
+    in colour instead, as it is.
+
+    Pages coming into range with nothing to show are first given a quick, low resolution,
+    draft render (from a second copy of the document, without anti-aliasing), which is shown
+    until the full quality render arrives. Drafts and full renders have separate queues.
+    """
+
+    CurrentPageChanged = QSignal(int, int, name='currentPageChanged')
 
     DefaultZoom = 100
     ZoomConfigKey = 'zoom_pdf'
+    DefaultPrefetch = 2 # pages
+    PrefetchConfigKey = 'pdf_prefetch'
+    DefaultCacheSize = 256 # MiB
+    CacheSizeConfigKey = 'pdf_cache_size'
+    DefaultDiskCacheSize = 1024 # MiB
+    DiskCacheSizeConfigKey = 'pdf_disk_cache_size'
+    RenderServerConfigKey = 'pdf_render_server'
+    GrayscaleConfigKey = 'pdf_grayscale'
+    GrayscalePaletteConfigKey = 'pdf_grayscale_palette'
+    PrefetchTime = 3 # s of auto-scrolling ahead
+    MaxPrefetchScreens = 4 # however fast the auto-scrolling
+    DraftScale = 0.35 # of the full resolution
+    DraftThreads = 1
+    FullThreads = 2
+    PageMargin = 9 # px, around the column of pages
+    PageSpacing = 6 # px, between pages
+    ScrollStep = 20 # px
 
     def __init__(self, application, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._application = application
 
-        self.setAlignment(Qt.AlignHCenter)
-        self.setWidgetResizable(True)
-
-        self.main_container = QWidget()
-        self.main_container.setLayout(QVBoxLayout())
-        self.main_container.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
-        self.setWidget(self.main_container)
+        self.viewport().setBackgroundRole(QPalette.Window)
+        self.verticalScrollBar().setSingleStep(self.ScrollStep)
+        self.horizontalScrollBar().setSingleStep(self.ScrollStep)
 
-        self.page_images = []
+        self.pages = []
+        self._page_sizes = []
+        self._geometry = PageGeometry()
+        self._content_width = 0
+        self._shown = set()
+        self._current_page = 0
+        self._velocity_source = None
+        self._tone = None
+        self._colour_pages = set()
         self._pdf = None
+        self._draft_pdf = None
+        self._zoom_dpi = 0
         self._zoom_percentage = \
             self._application.register_config(self.ZoomConfigKey, self.DefaultZoom)
+        self._prefetch = \
+            self._application.register_config(self.PrefetchConfigKey, self.DefaultPrefetch)
+
+        self._cache_size = \
+            self._application.register_config(self.CacheSizeConfigKey, self.DefaultCacheSize)
+        self._cache = PageCache(self._cache_size() * 1024 * 1024)
+        self._document_serial = 0
+
+        self._disk_cache_size = self._application.register_config(
+            self.DiskCacheSizeConfigKey, self.DefaultDiskCacheSize)
+        self._disk_cache = DiskPageCache(
+            path.join(__cache_dir__, 'pages'), self._disk_cache_size() * 1024 * 1024)
+        self._file_digest = None
+
+        self._renderer = PageRenderer(self, self.FullThreads)
+        self._renderer.pageRendered.connect(self.on_page_rendered)
+        self._draft_renderer = PageRenderer(self, self.DraftThreads)
+        self._draft_renderer.pageRendered.connect(self.on_draft_rendered)
+
+        self._use_render_server = \
+            self._application.register_config(self.RenderServerConfigKey, False)
+        self._render_server = RenderServer(self.FullThreads)
+        self._rendering_remotely = False
+        # After the renderers have finished with it.
+        QCoreApplication.instance().aboutToQuit.connect(self._render_server.shutdown)
+
+        self._grayscale = self._application.register_config(self.GrayscaleConfigKey, False)
+        self._grayscale_palette = \
+            self._application.register_config(self.GrayscalePaletteConfigKey, True)
+
+        self.verticalScrollBar().valueChanged.connect(self.update_rendered)
+        self.verticalScrollBar().rangeChanged.connect(self.update_rendered)
+        self.horizontalScrollBar().valueChanged.connect(self.update_rendered)
+        self.verticalScrollBar().valueChanged.connect(self.update_current_page)
+        self.verticalScrollBar().rangeChanged.connect(self.update_current_page)
 
     def clear(self):
         # @todo: scroll to top of area, (?conditionally - don't want to do that on zoom)
-        layout = self.main_container.layout()
-        while not layout.isEmpty():
-            layout_item = layout.takeAt(0)
-            layout_item.widget().deleteLater()
+        self._renderer.cancel_all()
+        self._draft_renderer.cancel_all()
+        self.pages = []
+        self._page_sizes = []
+        self._geometry = PageGeometry()
+        self._content_width = 0
+        self._shown = set()
+        self._update_scrollbars()
+        self.viewport().update()
+        self.update_current_page()
+
+    @property
+    def cache_stats(self):
+        return self._cache.stats
+
+    @property
+    def disk_cache_stats(self):
+        return self._disk_cache.stats
+
+    @property
+    def render_stats(self):
+        return {
+            'draft': self._draft_renderer.stats,
+            'full': self._renderer.stats,
+            'server': self._render_server.stats if self._rendering_remotely else None,
+            'colour_pages': len(self._colour_pages) if self._tone else None,
+        }
+
+    def _cache_key(self, page_num, tile):
+        return (
+            self._document_serial, page_num, tile, self._zoom_dpi, int(self._pdf.renderHints()),
+            self._page_tone(page_num))
+
+    def _disk_cache_key(self, page_num, tile):
+        if not self._file_digest:
+            return None
+        return (
+            self._file_digest, page_num, tile, self._zoom_dpi, int(self._pdf.renderHints()),
+            self._page_tone(page_num))
+
+    def _page_tone(self, page_num):
+        """The tone to render a page in grayscale in, or None to render it in colour."""
+        if page_num in self._colour_pages:
+            return None
+        return self._tone
+
+    def _paper_colour(self, page_num):
+        tone = self._page_tone(page_num)
+        if not tone:
+            return QColor(Qt.white)
+        return QColor(tone[1], tone[1], tone[1])
+
+    def _matches_tone(self, page_num, image):
+        """
+        Whether a render is as its page is now rendered: in grayscale, or in colour.
+
+        A render that couldn't be made grayscale, having colour in it, is the first sign
+        that its page needs rendering in colour; so the page is cleared, and rendered again
+        in colour throughout, rather than shown part one, part the other.
+        """
+        grayscale = image.format() == QImage.Format_Grayscale8
+        if grayscale == (self._page_tone(page_num) is not None):
+            return True
+        if grayscale:
+            # Rendered before its page was found to have colour in it.
+            return False
+
+        self._colour_pages.add(page_num)
+        for key in list(self._renderer.pending):
+            if key[0] == page_num:
+                self._renderer.cancel(key)
+        self._draft_renderer.cancel(page_num)
+        self.evict_page(page_num)
+        QTimer.singleShot(0, self.update_rendered)
+        return True
+
+    def current_page(self):
+        """The (1-based) page at the top of the viewport, plus how far down it is shown from."""
+        page_index, fraction = self._geometry.page_at(self.verticalScrollBar().value())
+        return page_index + 1 + fraction
 
     def go_to_page(self, page_index, page_fraction=0):
-        layout = self.main_container.layout()
-        page_index = min(int(page_index) - 1, layout.count())
+        position = self._geometry.offset(int(page_index) - 1, page_fraction or 0)
+        self.verticalScrollBar().setValue(round(position))
 
-        # Not sure why the magic number is needed, but without it there's a
-        # decrease in accuracy further down the document one goes.
-        margin = layout.getContentsMargins()
-        margin = max(margin[1], margin[3]) + 1 # max(<top>, <bottom>) + <magic>
+    def _content_left(self):
+        """Where the left edge of the pages' column is, in the viewport."""
+        # Centred, when narrower than the viewport
+        return max(0, (self.viewport().width() - self._content_width) // 2) \
+            - self.horizontalScrollBar().value()
 
-        position = 0
-        for idx in range(page_index):
-            position += layout.itemAt(idx).widget().pixmap().height()
-            position += margin
+    def _page_left(self, page_num):
+        """Where the left edge of a page is, in the column of pages."""
+        # Pages narrower than the widest are centred.
+        return (self._content_width - self.pages[page_num].size.width()) // 2
 
-        position += round(layout.itemAt(page_index).widget().pixmap().height() * page_fraction)
-        self.verticalScrollBar().setValue(position)
+    def _page_viewport_rect(self, page_num, rect=None):
+        """Where a page (or the given part of it) is, in the viewport."""
+        if rect is None:
+            rect = self.pages[page_num].rect
+        return rect.translated(
+            self._content_left() + self._page_left(page_num),
+            self._geometry.tops[page_num] - self.verticalScrollBar().value())
 
-    def render(self):
-        if not self._pdf:
-            return
+    def _page_source(self, page_num, draft=False):
+        """What to render a page from."""
+        document = self._draft_pdf if draft else self._pdf
+        if self._rendering_remotely:
+            return self._render_server.page(page_num, int(document.renderHints()))
+        return document.page(page_num)
+
+    def _update_page(self, page_num, rect=None):
+        self.viewport().update(self._page_viewport_rect(page_num, rect))
+
+    def _update_scrollbars(self):
+        viewport = self.viewport().size()
+        height = self._geometry.bottom + self.PageMargin if self.pages else 0
+        self.verticalScrollBar().setRange(0, max(0, height - viewport.height()))
+        self.verticalScrollBar().setPageStep(viewport.height())
+        self.horizontalScrollBar().setRange(0, max(0, self._content_width - viewport.width()))
+        self.horizontalScrollBar().setPageStep(viewport.width())
+
+    def _viewport_rect(self):
+        """The part of the column of pages in view."""
+        viewport = self.viewport()
+        return QRect(
+            -self._content_left(), self.verticalScrollBar().value(),
+            viewport.width(), viewport.height())
+
+    def _travel_region(self, view, velocity):
+        """
+        The part of the column of pages to have rendered whilst auto-scrolling: the viewport,
+        extended in the direction of travel as far as will be scrolled to in `PrefetchTime`.
+        """
+        ahead = min(
+            abs(velocity) * self.PrefetchTime, view.height() * self.MaxPrefetchScreens)
+        ahead = round(ahead) + PageTiles.TileSize
+        margin = PageTiles.TileSize
+        if velocity > 0:
+            return view.adjusted(-margin, -margin, margin, ahead)
+        return view.adjusted(-margin, -ahead, margin, margin)
+
+    def _visible_pages(self):
+        """The indexes of the first and last pages (at least partly) in the viewport."""
+        top = self.verticalScrollBar().value()
+        return self._geometry.pages_between(top, top + self.viewport().height())
+
+    def _wanted_tiles(self, page_num, view, margin):
+        """
+        The tiles of a page to have rendered: those within `margin` of the viewport, or, if
+        the page is out of view, those within a screenful of the edge nearest to it.
+        """
+        page = self.pages[page_num]
+        # The viewport, in the page's coordinates
+        view = view.translated(-self._page_left(page_num), -self._geometry.tops[page_num])
+        if view.bottom() < 0:
+            view.moveTop(0)
+        elif view.top() > page.size.height():
+            view.moveBottom(page.size.height())
+        return page.tiles_in(view.adjusted(-margin, -margin, margin, margin))
+
+    def _resize_pages(self):
+        # PDF page dimensions are in points: 1/72 of an inch.
+        scale = self._zoom_dpi / 72
+        for page, size in zip(self.pages, self._page_sizes):
+            page.resize(
+                QSize(round(size.width() * scale), round(size.height() * scale)),
+                self._zoom_dpi)
 
+        self._geometry = PageGeometry(
+            [page.size.height() for page in self.pages], self.PageMargin, self.PageSpacing)
+        self._content_width = max((page.size.width() for page in self.pages), default=0)
+        self._update_scrollbars()
+
+    def _update_zoom_dpi(self):
         screen = self._application.window.screen()
         dpi = screen.physicalDotsPerInch()
         if not dpi:
             dpi = screen.logicalDotsPerInch()
         percentage = self._zoom_percentage() / 100
-        zoom_dpi = dpi * percentage
+        self._zoom_dpi = dpi * percentage
+
+    def evict_page(self, page_num):
+        self.pages[page_num].clear()
+        self._shown.discard(page_num)
+        self._update_page(page_num)
+
+    def render(self):
+        if not self._pdf:
+            return
+
+        self._update_zoom_dpi()
+        for page_num in range(self._pdf.numPages()):
+            self._page_sizes.append(self._pdf.page(page_num).pageSizeF())
+            self.pages.append(PageTiles(QSize()))
+
+        self._resize_pages()
+        self.viewport().update()
+        self.update_rendered()
+        self.update_current_page()
+
+    def on_draft_rendered(self, page_num, image, _):
+        if page_num >= len(self.pages):
+            return
+        if not self._matches_tone(page_num, image):
+            return
+        self.pages[page_num].set_preview(to_pixmap(image))
+        self._shown.add(page_num)
+        self._update_page(page_num)
+
+    def on_page_rendered(self, key, image, shared):
+        page_num, tile = key
+        if page_num >= len(self.pages):
+            return
+        if not self._matches_tone(page_num, image):
+            return
+        pixmap = to_pixmap(image)
+        if shared:
+            shared.keep_for(pixmap)
+        self._cache.put(self._cache_key(page_num, tile), pixmap)
+        self._show_tile(page_num, tile, pixmap)
+
+    def paintEvent(self, event):
+        # pylint: disable=invalid-name
+        if not self.pages:
+            return
+        painter = QPainter(self.viewport())
+        top = self.verticalScrollBar().value() + event.rect().top()
+        first, last = self._geometry.pages_between(top, top + event.rect().height())
+        for page_num in range(first, last + 1):
+            page_rect = self._page_viewport_rect(page_num)
+            clip = event.rect().intersected(page_rect)
+            if clip.isEmpty():
+                continue
+            painter.save()
+            painter.translate(page_rect.topLeft())
+            self.pages[page_num].paint(
+                painter, clip.translated(-page_rect.topLeft()), self._paper_colour(page_num))
+            painter.restore()
+
+    def update_rendered(self, _=None):
+        """Renders the tiles in and near the viewport, discarding those far from it."""
+        if not self.pages:
+            return
+
+        view = self._viewport_rect()
+        first, last = self._visible_pages()
+        prefetch = self._prefetch()
+        velocity = self._velocity_source() if self._velocity_source else 0
+
+        if velocity:
+            # Everything up to where the auto-scrolling will have got to, nearest first; of
+            # what's behind, only as much as it would take to scroll back a little.
+            region = self._travel_region(view, velocity)
+            region_first, region_last = \
+                self._geometry.pages_between(region.top(), region.bottom())
+            if velocity > 0:
+                keep_first, keep_last = first - 1, region_last + prefetch
+                kept_region = region.adjusted(
+                    -view.height(), 0, view.height(), view.height())
+                ahead = range(last + 1, region_last + 1)
+            else:
+                keep_first, keep_last = region_first - prefetch, last + 1
+                kept_region = region.adjusted(
+                    -view.height(), -view.height(), view.height(), 0)
+                ahead = range(first - 1, region_first - 1, -1)
+            pages = [(page_num, 0) for page_num in range(first, last + 1)]
+            pages.extend((page_num, -distance) for distance, page_num in enumerate(ahead, 1))
+            margin = 0
+        else:
+            # Those in view first, then those either side of the viewport, nearest first.
+            region = view
+            keep_first, keep_last = first - prefetch * 2, last + prefetch * 2
+            kept_region = view.adjusted(
+                -view.height(), -view.height(), view.height(), view.height())
+            pages = [(page_num, 0) for page_num in range(first, last + 1)]
+            for distance in range(1, prefetch + 1):
+                pages.extend(((last + distance, -distance), (first - distance, -distance)))
+            margin = PageTiles.TileSize
 
-        for page in self._pdf:
-            rendered = page.renderToImage(zoom_dpi, zoom_dpi)
+        for page_num in list(self._shown):
+            if page_num < keep_first or page_num > keep_last:
+                self.evict_page(page_num)
+                continue
+            page = self.pages[page_num]
+            kept = self._wanted_tiles(page_num, kept_region, 0)
+            for tile in list(page.tiles):
+                if tile not in kept:
+                    page.remove_tile(tile)
 
-            page_image = QLabel()
-            page_image.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
-            page_image.setPixmap(QPixmap.fromImage(rendered))
-            self.main_container.layout().addWidget(page_image)
+        wanted = {}
+        for page_num, priority in pages:
+            if not 0 <= page_num < len(self.pages):
+                continue
+            in_view = self._wanted_tiles(page_num, view, 0) if not priority else ()
+            for tile in self._wanted_tiles(page_num, region, margin):
+                wanted[(page_num, tile)] = 0 if tile in in_view else priority - 1
+
+        # No point rendering what has since scrolled out of range.
+        wanted_pages = {page_num for page_num, _ in wanted}
+        for key in list(self._renderer.pending):
+            if key not in wanted:
+                self._renderer.cancel(key)
+        for page_num in list(self._draft_renderer.pending):
+            if page_num not in wanted_pages:
+                self._draft_renderer.cancel(page_num)
+
+        for key, priority in wanted.items():
+            page_num, tile = key
+            page = self.pages[page_num]
+            if tile in page.tiles:
+                continue
+            # Pages already showing something (if not sharp) don't need a draft.
+            if self._draft_pdf and not page.has_content():
+                self._draft_renderer.request(
+                    page_num, self._page_source(page_num, draft=True),
+                    self._zoom_dpi * self.DraftScale, priority,
+                    tone=self._page_tone(page_num))
+
+            if key in self._renderer.pending:
+                continue
+            pixmap = self._cache.get(self._cache_key(page_num, tile))
+            if pixmap:
+                self._show_tile(page_num, tile, pixmap)
+            else:
+                self._renderer.request(
+                    key, self._page_source(page_num), self._zoom_dpi, priority,
+                    page.tile_rect(tile), self._disk_cache_key(page_num, tile),
+                    self._page_tone(page_num))
 
     def scroll(self, step):
         scrollbar = self.verticalScrollBar()
         scrollbar.setValue(scrollbar.value() + step)
 
-    def set_pdf(self, pdf_document):
+    def reset_stats(self):
+        self._cache.reset_stats()
+        self._disk_cache.reset_stats()
+        self._renderer.reset_stats()
+        self._draft_renderer.reset_stats()
+        self._render_server.reset_stats()
+
+    def resizeEvent(self, event):
+        # pylint: disable=invalid-name
+        super().resizeEvent(event)
+        self._update_scrollbars()
+        self.update_rendered()
+
+    def scrollContentsBy(self, dx, dy):
+        # pylint: disable=invalid-name
+        # Only what's newly exposed needs painting.
+        self.viewport().scroll(dx, dy)
+
+    def set_velocity_source(self, velocity_source):
+        """
+        Sets where to get the auto-scrolling speed from, in pixels per second (negative when
+        scrolling upwards), for prefetching to follow.
+        """
+        self._velocity_source = velocity_source
+
+    def set_pdf(self, pdf_document, filename=None):
         # pylint: disable=no-member
         pdf_document.setRenderHint(Poppler.Document.RenderHint.Antialiasing, True)
         pdf_document.setRenderHint(Poppler.Document.RenderHint.TextAntialiasing, True)
         self._pdf = pdf_document
+        # Render hints apply to a whole document, so drafts are rendered from a copy of it.
+        self._draft_pdf = Poppler.Document.load(filename) if filename else None
+        self._document_serial += 1
+        self._cache.clear()
+        self._cache.set_budget(self._cache_size() * 1024 * 1024)
+
+        self._tone = None
+        if self._grayscale():
+            self._tone = palette_tone(self.palette()) if self._grayscale_palette() else PLAIN_TONE
+        self._colour_pages = set()
+        # Pages in the palette's tone would be lost against the palette's window colour.
+        self.viewport().setBackgroundRole(
+            QPalette.Mid if self._tone not in (None, PLAIN_TONE) else QPalette.Window)
+
+        # Hashed by whichever render worker first looks in the disk cache.
+        self._file_digest = None
+        if filename and self._disk_cache_size():
+            self._file_digest = FileDigest(filename)
+        self._disk_cache.set_budget(self._disk_cache_size() * 1024 * 1024)
+        self._renderer.disk_cache = self._disk_cache
+
+        # Worker processes open the file for themselves.
+        self._renderer.forget_failures()
+        self._rendering_remotely = bool(filename and self._use_render_server())
+        if self._rendering_remotely:
+            self._render_server.set_document(filename)
         self.render()
 
+    def _show_tile(self, page_num, tile, pixmap):
+        page = self.pages[page_num]
+        had_stale_tiles = page.has_content()
+        page.set_tile(tile, pixmap)
+        self._shown.add(page_num)
+        # Old tiles covered by this one will have been let go of, and may extend beyond it.
+        self._update_page(page_num, None if had_stale_tiles else page.tile_rect(tile))
+
+    def update_current_page(self, _=None):
+        current_page = int(self.current_page()) if self.pages else 0
+        if current_page != self._current_page:
+            self._current_page = current_page
+            self.CurrentPageChanged.emit(current_page, len(self.pages))
+
+    def zoom(self):
+        if not self.pages:
+            return
+
+        position = self.current_page()
+        self._renderer.cancel_all()
+        self._draft_renderer.cancel_all()
+
+        # Quietly, so pages aren't discarded on account of the positions passed through.
+        scrollbars = (self.verticalScrollBar(), self.horizontalScrollBar())
+        for scrollbar in scrollbars:
+            scrollbar.blockSignals(True)
+        self._update_zoom_dpi()
+        self._resize_pages()
+        self.go_to_page(int(position), position % 1)
+        for scrollbar in scrollbars:
+            scrollbar.blockSignals(False)
+        self.viewport().update()
+        self.update_rendered()
+        self.update_current_page()
+
     def zoom_in(self):
         percentage = self._zoom_percentage()
         if percentage >= 300:
             return
         self._application.save_config(self.ZoomConfigKey, percentage + 10)
-        self.clear()
-        self.render()
+        self.zoom()
 
     def zoom_out(self):
         percentage = self._zoom_percentage()
         if percentage <= 10:
             return
         self._application.save_config(self.ZoomConfigKey, percentage - 10)
-        self.clear()
-        self.render()
+        self.zoom()
 
     def zoom_reset(self):
         self._application.save_config(self.ZoomConfigKey, self.DefaultZoom)
-        self.clear()
-        self.render()
+        self.zoom()
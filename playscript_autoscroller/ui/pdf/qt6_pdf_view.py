@@ -1,10 +1,13 @@
 
+from qtpy.QtCore import Signal as QSignal
 from qtpy.QtPdf import QPdfDocument
 from qtpy.QtPdfWidgets import QPdfView
 
 
 class Qt6PdfView(QPdfView):
 
+    CurrentPageChanged = QSignal(int, int, name='currentPageChanged')
+
     DefaultZoom = 100
     ZoomConfigKey = 'zoom_pdf'
 
@@ -18,8 +21,20 @@ class Qt6PdfView(QPdfView):
         self._zoom_percentage = \
             self._application.register_config(self.ZoomConfigKey, self.DefaultZoom)
 
+        self.pageNavigator().currentPageChanged.connect(self.on_current_page_changed)
+
     def clear(self):
         self.setDocument(QPdfDocument(self))
+        self.CurrentPageChanged.emit(0, 0)
+
+    def current_page(self):
+        return self.pageNavigator().currentPage()
+
+    def on_current_page_changed(self, page):
+        document = self.document()
+        page_count = document.pageCount() if document else 0
+        # The navigator counts pages from 0.
+        self.CurrentPageChanged.emit(page + 1 if page_count else 0, page_count)
 
     def go_to_page(self, page_index, page_fraction=0):
         navigator = self.pageNavigator()
@@ -29,9 +44,15 @@ class Qt6PdfView(QPdfView):
         scrollbar = self.verticalScrollBar()
         scrollbar.setValue(scrollbar.value() + step)
 
-    def set_pdf(self, pdf_document):
+    def set_pdf(self, pdf_document, filename=None):
+        # pylint: disable=unused-argument
         self.setDocument(pdf_document)
 
+    def set_velocity_source(self, velocity_source):
+        # pylint: disable=unused-argument
+        # QPdfView does its own rendering, so has no use for this.
+        pass
+
     def zoom_in(self):
         percentage = self._zoom_percentage()
         if percentage >= 300:
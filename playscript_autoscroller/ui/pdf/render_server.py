@@ -0,0 +1,183 @@
+"""
+Rasterisation of PDF pages in separate processes.
+
+Each worker process opens the document itself, renders into a block of shared memory, and
+hands back only the name and layout of that block; the GUI process wraps the block as a
+`QImage` without copying it, and keeps it for as long as any pixmap made from it.
+
+Rendering this way neither competes for the GUI process's GIL, nor, should Poppler crash on
+a malformed page, takes the GUI process down with it: the crashed pool of workers is
+replaced, and the render tried once more before being given up on.
+"""
+
+import multiprocessing
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from threading import Lock
+
+from qtpy.QtGui import QImage
+
+
+# Per worker process: the document most recently rendered from, as (filename, document).
+_document = (None, None)
+
+RENDER_HINTS = (
+    'Antialiasing',
+    'TextAntialiasing',
+    'TextHinting',
+    'TextSlightHinting',
+    'ThinLineSolid',
+    'ThinLineShape',
+)
+
+
+def _load_document(filename, render_hints):
+    # pylint: disable=global-statement
+    global _document
+    from popplerqt5 import Poppler # pylint: disable=import-outside-toplevel
+
+    if _document[0] != filename:
+        _document = (filename, Poppler.Document.load(filename))
+    document = _document[1]
+    for name in RENDER_HINTS:
+        hint = getattr(Poppler.Document.RenderHint, name, None)
+        if hint is not None:
+            document.setRenderHint(hint, bool(render_hints & int(hint)))
+    return document
+
+
+def _render_page(filename, render_hints, page_num, dpi, rect):
+    """In a worker process: renders a page into shared memory, returning how to find it."""
+    page = _load_document(filename, render_hints).page(page_num)
+    if rect:
+        image = page.renderToImage(dpi, dpi, *rect)
+    else:
+        image = page.renderToImage(dpi, dpi)
+
+    bits = image.constBits()
+    bits.setsize(image.sizeInBytes())
+    memory = shared_memory.SharedMemory(create=True, size=max(1, image.sizeInBytes()))
+    memory.buf[:image.sizeInBytes()] = memoryview(bits)
+    # Unlinked by the GUI process once done with. (Or, should the result never reach it, by
+    # the resource tracker, shared with the GUI process, when that exits.)
+    memory.close()
+    return (
+        memory.name, image.width(), image.height(), image.bytesPerLine(), int(image.format()))
+
+
+class SharedImage:
+    """
+    A rendered image in shared memory, and the `QImage` wrapping it.
+
+    The memory is freed once each of its `users` has called `release`; any `QImage` sharing
+    its data must be done with by then. Further users may be added with `keep_for`.
+    """
+
+    def __init__(self, name, width, height, bytes_per_line, image_format, users):
+        self._memory = shared_memory.SharedMemory(name)
+        self.image = QImage(
+            self._memory.buf, width, height, bytes_per_line, QImage.Format(image_format))
+        self._users = users
+        self._lock = Lock()
+
+    def keep_for(self, owner):
+        """
+        Keeps the memory until `owner` is garbage collected: as a pixmap made from `image`
+        (rather than from a copy of it) may go on using the memory.
+        """
+        with self._lock:
+            self._users += 1
+        weakref.finalize(owner, self.release)
+
+    def release(self):
+        with self._lock:
+            self._users -= 1
+            if self._users:
+                return
+        self.image = None
+        self._memory.close()
+        self._memory.unlink()
+
+
+class RemotePage:
+    """Stands in for a `Poppler.Page`, as given to `PageRenderer`."""
+
+    def __init__(self, server, page_num, render_hints):
+        self._server = server
+        self._page_num = page_num
+        self._render_hints = render_hints
+
+    def render(self, dpi, rect):
+        """Returns a `SharedImage` (to be released by two users), or None if rendering failed."""
+        if rect:
+            rect = (rect.x(), rect.y(), rect.width(), rect.height())
+        return self._server.render(self._page_num, self._render_hints, dpi, rect)
+
+
+class RenderServer:
+    """A pool of worker processes rendering pages of one document at a time."""
+
+    def __init__(self, workers):
+        self._workers = workers
+        self._executor = None
+        self._lock = Lock()
+        self._filename = None
+        self.crashes = 0
+        self.failures = 0
+
+    @property
+    def stats(self):
+        return {
+            'workers': self._workers,
+            'crashes': self.crashes,
+            'failures': self.failures,
+        }
+
+    def _get_executor(self):
+        with self._lock:
+            if not self._executor:
+                # Not forked: the GUI process has too many threads for that to be safe.
+                self._executor = ProcessPoolExecutor(
+                    self._workers, mp_context=multiprocessing.get_context('spawn'))
+            return self._executor
+
+    def _replace_executor(self, broken):
+        with self._lock:
+            if self._executor is broken:
+                self.crashes += 1
+                broken.shutdown(wait=False)
+                self._executor = None
+
+    def page(self, page_num, render_hints):
+        return RemotePage(self, page_num, render_hints)
+
+    def render(self, page_num, render_hints, dpi, rect):
+        # Called from the render worker threads, each waiting (without the GIL) on its render.
+        for _ in range(2):
+            executor = self._get_executor()
+            try:
+                result = executor.submit(
+                    _render_page, self._filename, render_hints, page_num, dpi, rect
+                ).result()
+                return SharedImage(*result, users=2)
+            except BrokenProcessPool:
+                self._replace_executor(executor)
+            except Exception: # pylint: disable=broad-except
+                break
+        self.failures += 1
+        return None
+
+    def reset_stats(self):
+        self.crashes = 0
+        self.failures = 0
+
+    def set_document(self, filename):
+        self._filename = filename
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor:
+                self._executor.shutdown(wait=False)
+                self._executor = None